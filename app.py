@@ -1,38 +1,593 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-from scraper import get_all_news
+from scraper import (
+    collect_news, dedup, group_stories, pick_articles, rank_articles, rotation_slot,
+    source_stats, window_count, M_PHASE,
+)
+import changes
+import codec
+import fulltext
+import health
+import metrics
+import newsindex
+import prebuilt
+import snapshot
+import store
+import threading
 import time
 
 app = Flask(__name__)
-CORS(app)  # Izinkan request dari domain manapun (GitHub Pages, dsb)
+# Izinkan request dari domain manapun (GitHub Pages, dsb). Header non-standar
+# harus di-expose supaya bisa dibaca JavaScript di origin lain.
+EXPOSE_HEADERS = ("X-Snapshot-Age", "X-Refresh-State", "X-Push")
+CORS(app, expose_headers=list(EXPOSE_HEADERS))
 
-# ─── In-memory cache ───
-_cache = {
-    "data": [],
-    "fetched_at": 0
-}
+# ─── Snapshot cache (dibagi antar worker, lihat snapshot.py) ───
+# Isi snapshot: {"articles": [...], "pool": [...], "fetched_at": <epoch>,
+#                "sources": {...}, "health": {...}}
+#   articles = tampilan default /api/news (jendela rotasi, maks. 18)
+#   pool     = semua artikel terbaru dalam urutan rank_articles,
+#              dasar rotasi per seed & query filter / paging
+_snapshots = snapshot.from_env()
 # TTL 60 detik → setiap 1 menit data di-refresh otomatis
 # Kalau Anda mau lebih sering, kurangi angkanya
 CACHE_TTL = 60
+# Kalau refresh gagal, coba lagi lebih cepat dari CACHE_TTL
+RETRY_DELAY = 10
+# Seberapa sering worker non-leader membaca snapshot baru & mencoba jadi leader
+FOLLOW_INTERVAL = 2
+
+# ─── Article store (SQLite, lihat store.py) ───
+# Ditulis hanya oleh proses yang menjadi leader; worker lain membukanya
+# untuk membaca (/api/search). Snapshot diambil dari artikel yang
+# terlihat dalam SERVE_WINDOW detik terakhir.
+SERVE_WINDOW = 30 * 60
+POOL_SIZE    = 200
+_articles = None
+_articles_lock = threading.Lock()
+
+# Isi artikel untuk pencarian diambil di belakang oleh leader setelah
+# setiap refresh (lihat fulltext.py); False → hanya judul yang di-index
+FETCH_BODIES = True
+_body_fetcher = None
+
+# ─── Background refresher (stale-while-revalidate) ───
+# Satu thread per proses; hanya worker yang memegang lock (leader) yang
+# benar-benar men-scrape dan menulis snapshot, yang lain cukup membaca.
+# Leader tetap selama prosesnya hidup (lihat snapshot.py), jadi jeda
+# retry & state per proses tidak berpindah-pindah worker. Setiap kali
+# state-nya berubah, leader menerbitkannya lewat _snapshots.write_state();
+# header X-Refresh-State & /api/status di semua worker membaca dari situ
+# (lihat _refresh_state).
+#
+# Request tidak menjalankan scrape sendiri — kecuali di host yang tidak
+# menjalankan thread latar (mis. uWSGI tanpa enable-threads di
+# PythonAnywhere, tanpa hook gunicorn): di sana thread refresher dibuat
+# tapi tidak pernah berputar. Selama itu, request yang mendapati snapshot
+# kosong / lebih tua dari INLINE_STALE menjalankan satu putaran refresher
+# sendiri (satu request sekaligus, lihat _inline_refresh). Alternatifnya,
+# jadwalkan `python app.py --refresh` dari cron / scheduled task.
+INLINE_STALE = 2 * CACHE_TTL
+_refresh = {
+    "state"        : "idle",   # idle | running | error
+    "leader"       : False,    # apakah proses ini leader
+    "last_started" : 0,
+    "last_duration": None,
+    "last_error"   : None,
+    "next_at"      : 0,
+}
+_refresher_lock = threading.Lock()
+_refresher_thread = None
+_tick_lock = threading.Lock()   # satu putaran sekaligus: thread refresher atau request
+_loop_ticks = 0                 # putaran yang sudah dimulai oleh thread refresher
+
+# ─── Metrik (lihat metrics.py; fase scrape/dedup/images di scraper.py) ───
+_M_REFRESHES = metrics.Counter(
+    "packnews_refresh_total", "Refresh yang dijalankan leader", ("result",),
+)
+_M_SNAPSHOT_READS = metrics.Counter(
+    "packnews_snapshot_reads_total",
+    "Pembacaan snapshot oleh request (hit = segar, stale = lewat CACHE_TTL, miss = kosong)",
+    ("result",),
+)
+_M_REQUESTS = metrics.Histogram(
+    "packnews_http_request_seconds", "Latensi request HTTP", ("endpoint", "status"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0),
+)
+_M_SNAPSHOT_AGE = metrics.Gauge("packnews_snapshot_age_seconds", "Umur snapshot yang disajikan")
+_M_POOL_SIZE = metrics.Gauge("packnews_snapshot_articles", "Jumlah artikel di pool snapshot")
+_M_CIRCUIT = metrics.Gauge(
+    "packnews_source_circuit_open", "1 kalau circuit sumber sedang open (dari snapshot)", ("source",),
+)
+
+
+def _snapshot_age(snap):
+    if not snap or not snap.get("fetched_at"):
+        return None
+    return time.time() - snap["fetched_at"]
+
+
+def _article_store():
+    global _articles
+    if _articles is None:
+        with _articles_lock:
+            if _articles is None:
+                _articles = store.from_env()
+    return _articles
+
+
+def _schedule_bodies(db):
+    global _body_fetcher
+    if _body_fetcher is None:
+        _body_fetcher = fulltext.BodyFetcher(db)
+    queued = _body_fetcher.schedule()
+    if queued:
+        print(f"Body: {queued} artikel diantrikan")
+
+
+def _write_snapshot(pool, fetched_at):
+    pool = rank_articles(group_stories(dedup(pool)))
+    _snapshots.write({
+        "articles"  : pick_articles(pool, slot=rotation_slot(fetched_at)),
+        "pool"      : pool,
+        "fetched_at": fetched_at,
+        "sources"   : source_stats(),
+        "health"    : health.snapshot(),
+    })
+
+
+def _warm_start():
+    """Belum ada snapshot → bangun dari article store tanpa menunggu scrape."""
+    db = _article_store()
+    updated = db.last_update()
+    if not updated:
+        return
+    pool = db.recent(SERVE_WINDOW, POOL_SIZE, now=updated)
+    if pool:
+        # fetched_at = waktu data sebenarnya → refresher tetap tahu kalau sudah basi
+        _write_snapshot(pool, updated)
+        print(f"Warm start: {len(pool)} artikel dari {db.path}")
+
+
+def _publish_refresh():
+    """Terbitkan state refresher leader untuk worker lain (gagal tulis → diabaikan)."""
+    try:
+        _snapshots.write_state({k: v for k, v in _refresh.items() if k != "leader"})
+    except OSError as e:
+        print(f"State refresher gagal ditulis: {e}")
+
+
+def _refresh_state():
+    """State refresher leader (dari proses ini kalau leader, kalau tidak dari store)."""
+    if _refresh["leader"]:
+        return dict(_refresh)
+    state = dict(_snapshots.read_state() or _refresh)
+    state["leader"] = False
+    return state
+
+
+def _refresh_once():
+    _refresh["state"]        = "running"
+    _refresh["last_started"] = time.time()
+    _publish_refresh()
+    try:
+        found = collect_news()
+        if not found:
+            raise RuntimeError("semua sumber kosong")
+        db = _article_store()
+        with M_PHASE.labels("store").time():
+            new, changed = db.upsert(found)
+            db.prune()
+        print(f"Store: {new} baru, {changed} berubah")
+        with M_PHASE.labels("snapshot").time():
+            _write_snapshot(db.recent(SERVE_WINDOW, POOL_SIZE), time.time())
+        if FETCH_BODIES and db.searchable:
+            _schedule_bodies(db)
+    except Exception as e:
+        # Snapshot lama tetap dipakai
+        _refresh["state"]      = "error"
+        _refresh["last_error"] = str(e)
+        ok = False
+    else:
+        _refresh["state"]      = "idle"
+        _refresh["last_error"] = None
+        ok = True
+    _M_REFRESHES.labels("ok" if ok else "error").inc()
+    _refresh["last_duration"] = round(time.time() - _refresh["last_started"], 3)
+    return ok
+
+
+def _refresher_tick():
+    """Satu putaran refresher; kembalikan jeda (detik) sebelum putaran berikutnya."""
+    if not _snapshots.claim():
+        # Worker lain leader → cukup ikuti snapshot-nya; ambil alih kalau leader mati
+        _refresh["leader"] = False
+        return FOLLOW_INTERVAL
+    _refresh["leader"] = True
+    if _snapshots.read() is None:
+        _warm_start()
+    age = _snapshot_age(_snapshots.read())
+    if age is not None and age < CACHE_TTL:
+        return CACHE_TTL - age
+    return CACHE_TTL if _refresh_once() else RETRY_DELAY
+
+
+def _refresher_loop():
+    global _loop_ticks
+    while True:
+        try:
+            with _tick_lock:
+                _loop_ticks += 1
+                delay = _refresher_tick()
+        except Exception as e:
+            _refresh["state"]      = "error"
+            _refresh["last_error"] = str(e)
+            delay = RETRY_DELAY
+        snap = _snapshots.read()
+        if snap:
+            _changes.observe(snap)
+        _refresh["next_at"] = time.time() + delay
+        if _refresh["leader"]:
+            _publish_refresh()
+        time.sleep(delay)
+
+
+def _ensure_refresher():
+    global _refresher_thread
+    if _refresher_thread is not None:
+        return
+    with _refresher_lock:
+        if _refresher_thread is None:
+            _refresher_thread = threading.Thread(
+                target=_refresher_loop, name="news-refresher", daemon=True
+            )
+            _refresher_thread.start()
+            # Counter & histogram proses ini ikut terlihat dari /metrics worker lain
+            metrics.start_flusher()
+
+
+def warm_up():
+    """
+    Siapkan proses sebelum request pertama (gunicorn post_worker_init):
+    snapshot terakhir dibaca dari disk — atau, kalau belum ada, dibangun
+    dari article store — lalu refresher dijalankan di belakang. Tidak
+    pernah menunggu scrape.
+    """
+    snap = _snapshots.read()
+    if not snap:
+        if _snapshots.claim() and _snapshots.read() is None:
+            _warm_start()
+        snap = _snapshots.read()
+    if snap:
+        _changes.observe(snap)
+    _ensure_refresher()
+
+
+def _inline_refresh(snap):
+    """
+    Fallback untuk host tanpa thread latar: thread refresher belum pernah
+    berputar dan snapshot kosong / basi → jalankan satu putaran di request
+    ini. Request lain yang datang bersamaan tidak ikut menunggu.
+    """
+    if _loop_ticks:
+        return snap
+    age = _snapshot_age(snap)
+    if age is not None and age < INLINE_STALE:
+        return snap
+    if not _tick_lock.acquire(blocking=False):
+        return snap
+    try:
+        if not _loop_ticks:
+            _refresher_tick()
+    except Exception as e:
+        _refresh["state"]      = "error"
+        _refresh["last_error"] = str(e)
+    finally:
+        _tick_lock.release()
+    if _refresh["leader"]:
+        _publish_refresh()
+    return _snapshots.read()
 
 
 def get_cached_news():
-    now = time.time()
-    if now - _cache["fetched_at"] > CACHE_TTL or not _cache["data"]:
-        _cache["data"]       = get_all_news(limit_per_source=3)
-        _cache["fetched_at"] = now
-    return _cache["data"]
+    """
+    Snapshot terakhir: {"articles": [...], "fetched_at": ...}. Tidak
+    menunggu scrape — saat cold start tanpa snapshot sama sekali, hasilnya
+    kosong dan klien menerima artikelnya lewat /api/news/changes (atau
+    /stream) begitu refresh pertama selesai. Pengecualiannya host yang
+    tidak menjalankan thread refresher (lihat _inline_refresh).
+    """
+    _ensure_refresher()
+    snap = _inline_refresh(_snapshots.read())
+    if not snap:
+        _M_SNAPSHOT_READS.labels("miss").inc()
+        return {"articles": [], "fetched_at": 0}
+    age = _snapshot_age(snap)
+    _M_SNAPSHOT_READS.labels("hit" if age is not None and age < CACHE_TTL else "stale").inc()
+    _changes.observe(snap)
+    return snap
+
+
+# ─── Index query per snapshot ───
+_index_cache = (None, None)   # (snapshot, NewsIndex), ditukar sekaligus
+
+
+def _news_index(snap):
+    """NewsIndex untuk snapshot ini (dibangun sekali per snapshot)."""
+    global _index_cache
+    cached_snap, index = _index_cache
+    if cached_snap is not snap:
+        index = newsindex.NewsIndex(snap.get("pool") or snap["articles"])
+        _index_cache = (snap, index)
+    return index
+
+
+# ─── Body /api/news yang sudah jadi (per snapshot + variasi query) ───
+_bodies = prebuilt.BodyCache()
+
+_QUERY_PARAMS = ("category", "source", "since", "cursor", "limit")
+
+
+def _parse_news_args(args):
+    """Query string → tuple yang bisa dipakai sebagai key cache; ValueError kalau salah."""
+    fields = newsindex.parse_fields(args.get("fields"))
+    if not any(k in args for k in _QUERY_PARAMS):
+        seed = args.get("seed")
+        return (False, fields, int(seed) if seed else None)
+    cursor = args.get("cursor") or None
+    if cursor:
+        newsindex.decode_cursor(cursor)
+    return (
+        True,
+        fields,
+        args.get("category") or None,
+        args.get("source") or None,
+        float(args["since"]) if args.get("since") else None,
+        cursor,
+        int(args.get("limit", newsindex.DEFAULT_LIMIT)),
+    )
+
+
+def _rotation_window(snap, seed):
+    """Seed klien → nomor jendela rotasi (dibatasi jumlah jendela → key cache terbatas)."""
+    pool = snap.get("pool") or snap["articles"]
+    windows = window_count(len(pool), newsindex.DEFAULT_LIMIT)
+    return (rotation_slot(snap["fetched_at"]) + seed) % windows
+
+
+def _news_payload(snap, key):
+    querying, fields = key[0], key[1]
+    next_cursor = None
+    if querying:
+        category, source, since, cursor, limit = key[2:]
+        articles, next_cursor = _news_index(snap).query(
+            category=category, source=source, since=since, cursor=cursor, limit=limit,
+        )
+    elif key[2] is not None:
+        articles = pick_articles(snap.get("pool") or snap["articles"], newsindex.DEFAULT_LIMIT, key[2])
+    else:
+        articles = snap["articles"]
+    payload = {
+        "status"    : "ok",
+        "count"     : len(articles),
+        "cached_at" : snap["fetched_at"],
+        "articles"  : newsindex.project(articles, fields),   # field: source, title, link, image, category, ...
+    }
+    if querying:
+        payload["next_cursor"] = next_cursor
+    return payload
 
 
 # ─── Endpoint utama ───
 @app.route("/api/news", methods=["GET"])
 def news():
-    articles = get_cached_news()
+    """
+    Tanpa parameter: tampilan default (jendela rotasi, maks. 18 artikel);
+    ?seed=<n> menggeser jendela per klien, tetap sama selama snapshot sama.
+    Dengan category / source / since / cursor / limit: query ke pool
+    artikel terbaru lewat index, hasil urut terbaru dulu + next_cursor.
+    fields=title,link,... membatasi field setiap artikel.
+
+    Body di-serialize & dikompres sekali per snapshot (lihat prebuilt.py),
+    dengan ETag; umur snapshot & status refresher ada di header
+    X-Snapshot-Age / X-Refresh-State (dan di /api/status).
+    """
+    snap = get_cached_news()
+    try:
+        key = _parse_news_args(request.args)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    if not key[0] and key[2] is not None:
+        key = (False, key[1], _rotation_window(snap, key[2]))
+
+    pre = _bodies.get(snap, key, lambda: _news_payload(snap, key))
+    age = _snapshot_age(snap)
+    headers = {"X-Refresh-State": _refresh_state()["state"]}
+    if PUSH_SSE:
+        headers["X-Push"] = "sse"
+    if age is not None:
+        headers["X-Snapshot-Age"] = f"{age:.1f}"
+    max_age = max(0, CACHE_TTL - age) if age is not None else 0
+    return prebuilt.respond(pre, max_age=max_age, headers=headers)
+
+
+# ─── Pencarian teks penuh (judul + isi, seluruh artikel di store) ───
+@app.route("/api/search", methods=["GET"])
+def search():
+    """
+    ?q=<kata kunci> → artikel yang memuat semua kata (setelah stemming),
+    urut relevansi. Opsional: category, source, limit, offset, fields.
+    Mencari di seluruh riwayat store (store.RETENTION), bukan hanya snapshot.
+    """
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"status": "error", "message": "parameter q wajib diisi"}), 400
+    try:
+        fields = newsindex.parse_fields(request.args.get("fields"))
+        limit = max(1, min(newsindex.MAX_LIMIT, int(request.args.get("limit", newsindex.DEFAULT_LIMIT))))
+        offset = max(0, int(request.args.get("offset", 0)))
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    db = _article_store()
+    if not db.searchable:
+        return jsonify({"status": "error", "message": "pencarian tidak tersedia (SQLite tanpa FTS5)"}), 503
+    articles = db.search(
+        query, limit=limit, offset=offset,
+        category=request.args.get("category") or None,
+        source=request.args.get("source") or None,
+    )
+    body = codec.dumps({
+        "status"     : "ok",
+        "query"      : query,
+        "count"      : len(articles),
+        "next_offset": offset + limit if len(articles) == limit else None,
+        "articles"   : newsindex.project(articles, fields),
+    })
+    return Response(body, mimetype="application/json")
+
+
+# ─── Status snapshot & refresher (tidak di-cache) ───
+@app.route("/api/status", methods=["GET"])
+def status():
+    snap = get_cached_news()
+    age  = _snapshot_age(snap)
     return jsonify({
-        "status"    : "ok",
-        "count"     : len(articles),
-        "cached_at" : _cache["fetched_at"],
-        "articles"  : articles   # setiap item sudah ada field: source, title, link, image, category
+        "status"   : "ok",
+        "cached_at": snap["fetched_at"],
+        "age"      : round(age, 1) if age is not None else None,
+        "count"    : len(snap["articles"]),
+        "refresh"  : _refresh_state(),
+    })
+
+
+# ─── Push perubahan: long-poll & Server-Sent Events ───
+# Satu subscriber SSE = satu koneksi yang ditahan terus. Murah di worker
+# gevent (greenlet), tapi di worker thread setiap tab memegang satu thread
+# selamanya. Karena itu SSE hanya diiklankan ke halaman (header X-Push di
+# /api/news) kalau proses ini di-monkey-patch gevent; selain itu halaman
+# cukup mem-poll /api/news/changes.
+#
+# Klien lain tetap bisa memanggil kedua endpoint langsung, jadi di worker
+# thread keduanya juga tidak pernah menahan thread: ?wait= dijawab
+# seketika (dengan saran `retry` dalam detik), dan /stream mengirim satu
+# diff lalu menutup koneksi dengan hint `retry:` — EventSource tersambung
+# ulang sendiri setelah PUSH_RETRY, dengan Last-Event-ID.
+_changes = changes.ChangeFeed()
+
+
+def _gevent_patched():
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched("socket")
+
+
+PUSH_SSE = _gevent_patched()
+
+LONGPOLL_MAX_WAIT = 55 if PUSH_SSE else 0   # detik
+SSE_HEARTBEAT     = 15         # detik
+PUSH_RETRY        = CACHE_TTL  # detik, saran jeda poll / reconnect di worker thread
+
+
+def _sse_event(diff) -> str:
+    data = codec.dumps(diff).decode("utf-8")
+    return f"event: diff\nid: {diff['token']}\ndata: {data}\n\n"
+
+
+@app.route("/api/news/changes", methods=["GET"])
+def news_changes():
+    """
+    Long-poll: ?since=<token> menunggu (maks. ?wait= detik, dibatasi
+    LONGPOLL_MAX_WAIT) sampai ada snapshot baru, lalu mengembalikan artikel
+    yang ditambah & link yang dihapus sejak token itu. Tanpa since → reset
+    berisi seluruh pool. Kalau wait dipotong (worker thread), jawaban
+    membawa `retry`: detik sebelum poll berikutnya.
+    """
+    get_cached_news()
+    since = request.args.get("since", "")
+    try:
+        asked = max(0.0, float(request.args.get("wait", 0)))
+    except ValueError:
+        return jsonify({"status": "error", "message": "wait harus angka"}), 400
+    wait = min(LONGPOLL_MAX_WAIT, asked)
+    if since and since == _changes.token and wait:
+        _changes.wait(since, wait)
+    payload = dict(status="ok", **_changes.changes_since(since))
+    if asked > wait:
+        payload["retry"] = PUSH_RETRY
+    return Response(codec.dumps(payload), mimetype="application/json")
+
+
+@app.route("/api/news/stream", methods=["GET"])
+def news_stream():
+    """
+    SSE: event `diff` setiap snapshot berganti (id = token). Klien yang
+    tersambung ulang mengirim Last-Event-ID dan hanya menerima selisihnya.
+    Di worker thread (PUSH_SSE False): paling banyak satu diff, lalu
+    koneksi ditutup dengan `retry:` PUSH_RETRY.
+    """
+    get_cached_news()
+    since = request.headers.get("Last-Event-ID") or request.args.get("since", "")
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+    if not PUSH_SSE:
+        body = f"retry: {PUSH_RETRY * 1000}\n\n"
+        diff = _changes.changes_since(since)
+        if diff["token"] != since:
+            body += _sse_event(diff)
+        return Response(body, mimetype="text/event-stream", headers=headers)
+
+    def events():
+        token = since
+        while True:
+            if token == _changes.token and not _changes.wait(token, SSE_HEARTBEAT):
+                yield ": keepalive\n\n"
+                continue
+            diff = _changes.changes_since(token)
+            token = diff["token"]
+            yield _sse_event(diff)
+
+    return Response(stream_with_context(events()), mimetype="text/event-stream", headers=headers)
+
+
+# ─── Latensi request & metrik Prometheus ───
+@app.before_request
+def _start_timer():
+    request.environ["packnews.t0"] = time.perf_counter()
+
+
+@app.after_request
+def _observe_request(res):
+    t0 = request.environ.get("packnews.t0")
+    if t0 is not None and request.endpoint:
+        # Untuk SSE yang diukur hanya sampai response mulai dikirim
+        _M_REQUESTS.labels(request.endpoint, res.status_code).observe(time.perf_counter() - t0)
+    return res
+
+
+@app.route("/metrics", methods=["GET"])
+def prometheus_metrics():
+    """Metrik semua worker (dijumlah) dalam format teks Prometheus (lihat metrics.py)."""
+    snap = _snapshots.read()
+    if snap:
+        _M_SNAPSHOT_AGE.set(_snapshot_age(snap) or 0)
+        _M_POOL_SIZE.set(len(snap.get("pool") or snap.get("articles") or []))
+        for name, h in (snap.get("health") or {}).items():
+            _M_CIRCUIT.labels(name).set(1 if (h.get("open_until") or 0) > time.time() else 0)
+    return Response(metrics.render(), headers={"Content-Type": metrics.CONTENT_TYPE})
+
+
+# ─── Statistik & kesehatan sumber dari refresh terakhir ───
+@app.route("/api/sources", methods=["GET"])
+def sources():
+    snap = get_cached_news()
+    return jsonify({
+        "status"   : "ok",
+        "cached_at": snap["fetched_at"],
+        "sources"  : snap.get("sources", {}),
+        "health"   : snap.get("health", {}),
     })
 
 
@@ -42,5 +597,25 @@ def index():
     return jsonify({"message": "News Scraper API is running. Use /api/news"})
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="News Scraper API")
+    parser.add_argument("--refresh", action="store_true",
+                        help="jalankan satu putaran refresh lalu keluar (cron / scheduled task)")
+    args = parser.parse_args(argv)
+
+    if args.refresh:
+        # Tidak men-scrape kalau snapshot masih segar atau worker lain leader
+        _refresher_tick()
+        if _refresh["leader"]:
+            _publish_refresh()
+        state = _refresh_state()
+        print(f"Refresh: {state['state']}" + (f" ({state['last_error']})" if state["last_error"] else ""))
+        return 1 if state["state"] == "error" else 0
     app.run(debug=True, host="0.0.0.0", port=5000)
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
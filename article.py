@@ -0,0 +1,108 @@
+# article.py — Record artikel ringkas (__slots__), source & category di-intern
+#
+# Pool artikel yang disimpan per proses bisa ribuan item. Dict per artikel
+# jauh lebih boros daripada objek ber-slot, dan string `source` /
+# `category` yang sama terulang di setiap item. Article menyimpan field
+# tetap di slot, meng-intern source & category (satu objek string per
+# nilai), dan tetap bisa dibaca seperti dict — art["link"],
+# art.get("image"), dict(art) — jadi kode yang memakai dict tetap jalan.
+#
+# Field opsional (first_seen, last_seen, cluster, related) yang None
+# dianggap tidak ada: tidak muncul di keys() / JSON, art["cluster"] →
+# KeyError, persis seperti dict tanpa key itu.
+import sys
+
+FIELDS = (
+    "source", "title", "link", "image", "category",
+    "first_seen", "last_seen", "cluster", "related",
+)
+_FIELD_SET = frozenset(FIELDS)
+_REQUIRED = FIELDS[:5]
+
+
+class Article:
+    __slots__ = FIELDS
+
+    def __init__(self, source, title, link, image="", category="",
+                 first_seen=None, last_seen=None, cluster=None, related=None):
+        self.source     = sys.intern(source)
+        self.title      = title
+        self.link       = link
+        self.image      = image
+        self.category   = sys.intern(category)
+        self.first_seen = first_seen
+        self.last_seen  = last_seen
+        self.cluster    = cluster
+        self.related    = related
+
+    @classmethod
+    def from_dict(cls, data) -> "Article":
+        return cls(**{f: data[f] for f in FIELDS if f in data})
+
+    @classmethod
+    def of(cls, art) -> "Article":
+        """Article apa adanya, atau dibuat dari dict."""
+        return art if isinstance(art, cls) else cls.from_dict(art)
+
+    def replace(self, **changes) -> "Article":
+        """Salinan dengan beberapa field diganti (objek ini tidak diubah)."""
+        values = {f: getattr(self, f) for f in FIELDS}
+        values.update(changes)
+        return Article(**values)
+
+    def to_dict(self) -> dict:
+        # Ditulis eksplisit (bukan loop getattr): dipanggil per artikel
+        # setiap kali body JSON dibangun
+        data = {
+            "source"  : self.source,
+            "title"   : self.title,
+            "link"    : self.link,
+            "image"   : self.image,
+            "category": self.category,
+        }
+        if self.first_seen is not None:
+            data["first_seen"] = self.first_seen
+        if self.last_seen is not None:
+            data["last_seen"] = self.last_seen
+        if self.cluster is not None:
+            data["cluster"] = self.cluster
+        if self.related is not None:
+            data["related"] = self.related
+        return data
+
+    # ─── Akses gaya dict ───
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key not in _REQUIRED:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return key in _FIELD_SET and (key in _REQUIRED or getattr(self, key) is not None)
+
+    def keys(self):
+        return [f for f in FIELDS if f in self]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, (Article, dict)):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Article({self.to_dict()!r})"
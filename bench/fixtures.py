@@ -0,0 +1,45 @@
+# bench/fixtures.py — Lokasi & manifest fixture benchmark
+#
+# Fixture = body halaman listing / feed yang direkam dari situs asli,
+# disimpan per sumber:
+#   <dir>/<key sumber>/<kategori>.html
+#   <dir>/<key sumber>/<kategori>.feed.xml
+#   <dir>/manifest.json  → {"recorded_at", "pages": [{source, key, kind,
+#                           category, url, file, content_type}, ...]}
+import json
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+MANIFEST = "manifest.json"
+
+# Modul aplikasi ada di root repo
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def file_name(kind: str, category: str) -> str:
+    return f"{category}.feed.xml" if kind == "feed" else f"{category}.html"
+
+
+def load_manifest(directory=FIXTURE_DIR) -> dict:
+    path = os.path.join(directory, MANIFEST)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise SystemExit(
+            f"Fixture belum ada di {directory} — rekam dulu: python bench/record.py"
+        )
+
+
+def save_manifest(manifest: dict, directory=FIXTURE_DIR):
+    with open(os.path.join(directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def read_body(entry: dict, directory=FIXTURE_DIR) -> bytes:
+    with open(os.path.join(directory, entry["file"]), "rb") as f:
+        return f.read()
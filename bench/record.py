@@ -0,0 +1,67 @@
+# bench/record.py — Rekam halaman listing & feed semua sumber jadi fixture
+#
+# Mengambil setiap URL halaman (dan feed, kalau ada) dari scraper.SOURCES
+# sekali lewat fetcher.fetch, lalu menyimpan body apa adanya. Jalankan
+# ulang kalau layout situs berubah; benchmark (bench/run.py) setelah itu
+# tidak butuh jaringan sama sekali.
+#
+# Pemakaian:
+#   python bench/record.py [--out DIR] [--source KEY ...]
+import argparse
+import os
+import time
+
+from fixtures import FIXTURE_DIR, file_name, save_manifest
+
+import fetcher
+from scraper import SOURCES
+
+
+def _targets(sources):
+    for src in sources:
+        for url, cat in src["pages"]:
+            yield src, "html", cat, url
+            feed_url = src["feeds"].get(cat)
+            if feed_url:
+                yield src, "feed", cat, feed_url
+
+
+def record(out_dir=FIXTURE_DIR, keys=None):
+    sources = [s for s in SOURCES if not keys or s["key"] in keys]
+    pages = []
+    for src, kind, cat, url in _targets(sources):
+        rel = os.path.join(src["key"], file_name(kind, cat))
+        try:
+            page = fetcher.fetch(url)
+        except Exception as e:
+            print(f"  ✗ [{src['name']}] {kind} {cat}: {e}")
+            continue
+        os.makedirs(os.path.join(out_dir, src["key"]), exist_ok=True)
+        with open(os.path.join(out_dir, rel), "wb") as f:
+            f.write(page.body)
+        pages.append({
+            "source"      : src["name"],
+            "key"         : src["key"],
+            "kind"        : kind,
+            "category"    : cat,
+            "url"         : url,
+            "file"        : rel,
+            "content_type": "application/xml" if kind == "feed" else "text/html; charset=utf-8",
+        })
+        print(f"  ✓ [{src['name']}] {kind} {cat}: {len(page.body)} byte")
+    save_manifest({"recorded_at": time.time(), "pages": pages}, out_dir)
+    print(f"{len(pages)} fixture disimpan di {out_dir}")
+    return pages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rekam fixture benchmark dari situs asli")
+    parser.add_argument("--out", default=FIXTURE_DIR, help="direktori fixture")
+    parser.add_argument("--source", action="append", dest="keys",
+                        help="key sumber (boleh berulang; default semua)")
+    args = parser.parse_args(argv)
+    record(args.out, args.keys)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# bench/run.py — Benchmark offline: parser, pipeline, dan /api/news
+#
+# Fixture (lihat record.py) disajikan oleh http.server lokal; URL halaman
+# & feed di scraper.SOURCES ditulis ulang ke server itu, jadi seluruh jalur
+# fetch → parse → dedup → cluster berjalan tanpa jaringan luar.
+#
+# Yang diukur:
+#   parse.<key>.<kind>.<kategori>  → median ms parse satu halaman, peak &
+#                                    sisa memori (tracemalloc, KiB)
+#   pipeline.get_all_news          → latensi end-to-end (median / max ms)
+#   api.<skenario>                 → throughput /api/news (request/detik)
+#
+# Regresi: hasil dibandingkan dengan baseline JSON; metrik yang lebih
+# buruk dari THRESHOLD (relatif) membuat exit code 1.
+#
+# Pemakaian:
+#   python bench/run.py [--fixtures DIR] [--baseline FILE] [--save-baseline]
+#                       [--threshold 0.25] [--json FILE] [--report FILE]
+import argparse
+import contextlib
+import json
+import math
+import os
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fixtures import BENCH_DIR, FIXTURE_DIR, load_manifest, read_body
+
+# Snapshot di memori proses benchmark, bukan file bersama milik server asli
+os.environ["SNAPSHOT_BACKEND"] = "memory"
+
+import clusters
+import fetcher
+import health
+import scraper
+
+# scraper meng-import parser secara malas; muat di sini supaya biaya
+# import tidak ikut terukur sebagai waktu / memori parse halaman pertama
+import bs4         # noqa: F401
+import feedparser  # noqa: F401
+import soupsieve   # noqa: F401
+from lxml import etree  # noqa: F401
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+THRESHOLD = 0.25       # lebih lambat > 25% dari baseline → regresi
+PARSE_REPEAT = 20
+E2E_RUNS = 5
+API_DURATION = 2.0     # detik per skenario
+
+# Skenario /api/news: (nama, query string, header)
+API_SCENARIOS = (
+    ("default", "", {}),
+    ("default_gzip", "", {"Accept-Encoding": "gzip"}),
+    ("etag_304", "", None),   # header If-None-Match diisi dari response pertama
+    ("query_category", "?category=nasional&limit=10", {"Accept-Encoding": "gzip"}),
+)
+
+
+# ─── Server fixture lokal ───
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    routes = {}   # path → (body, content-type)
+
+    def do_GET(self):
+        hit = self.routes.get(self.path)
+        if hit is None:
+            self.send_error(404)
+            return
+        body, ctype = hit
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(manifest, directory):
+    """Jalankan server fixture; kembalikan (server, {url asli: url lokal})."""
+    routes = {}
+    for entry in manifest["pages"]:
+        routes["/" + entry["file"].replace(os.sep, "/")] = (
+            read_body(entry, directory), entry["content_type"],
+        )
+    handler = type("Handler", (_FixtureHandler,), {"routes": routes})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="bench-fixtures", daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    return server, {e["url"]: base + "/" + e["file"].replace(os.sep, "/") for e in manifest["pages"]}
+
+
+def rewrite_sources(urls, missing="http://127.0.0.1:9/missing"):
+    """Arahkan semua halaman & feed di registry ke server fixture."""
+    for src in scraper.SOURCES:
+        src["pages"] = [(urls.get(url, missing), cat) for url, cat in src["pages"]]
+        src["feeds"] = {cat: urls[url] for cat, url in src["feeds"].items() if url in urls}
+
+
+def reset_state():
+    """Kosongkan cache lintas refresh → setiap putaran = fetch & parse penuh."""
+    scraper._page_cache.clear()
+    scraper._feed_newest.clear()
+    scraper._stories = clusters.StoryIndex()
+    with health._registry_lock:
+        health._registry.clear()
+
+
+# ─── Pengukuran ───
+
+def _median_ms(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def _memory_kib(fn):
+    """(peak, sisa) memori yang dialokasikan fn, dalam KiB."""
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = fn()
+        after, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return (peak - before) / 1024, (after - before) / 1024
+
+
+def _chunks(body):
+    for i in range(0, len(body), fetcher.CHUNK_SIZE):
+        yield body[i:i + fetcher.CHUNK_SIZE]
+
+
+def _parsers(src, entry, body):
+    """[(nama engine, fungsi parse tanpa argumen)] untuk satu fixture."""
+    cat = entry["category"]
+    if entry["kind"] == "feed":
+        return [("feed", lambda: scraper._parse_feed(src, cat, body))]
+    engines = [(scraper.PARSER, lambda: scraper._parse_listing(src, cat, body))]
+    if scraper.STREAM_PARSE and scraper._streamable(src["name"]):
+        engines.append(("stream", lambda: scraper._stream_listing(src, cat, _chunks(body))))
+    return engines
+
+
+def bench_parse(manifest, directory, repeat=PARSE_REPEAT):
+    by_key = {src["key"]: src for src in scraper.SOURCES}
+    results = {}
+    for entry in manifest["pages"]:
+        src = by_key.get(entry["key"])
+        if src is None:
+            continue
+        body = read_body(entry, directory)
+        for engine, fn in _parsers(src, entry, body):
+            name = f"parse.{entry['key']}.{entry['category']}.{engine}"
+            peak, retained = _memory_kib(fn)
+            results[name] = {
+                "ms"         : round(_median_ms(fn, repeat), 3),
+                "peak_kib"   : round(peak, 1),
+                "retained_kib": round(retained, 1),
+                "bytes"      : len(body),
+            }
+    return results
+
+
+def bench_pipeline(runs=E2E_RUNS):
+    times = []
+    count = 0
+    for _ in range(runs):
+        reset_state()
+        t0 = time.perf_counter()
+        count = len(scraper.get_all_news())
+        times.append((time.perf_counter() - t0) * 1000)
+    return {"pipeline.get_all_news": {
+        "ms"      : round(statistics.median(times), 2),
+        "max_ms"  : round(max(times), 2),
+        "articles": count,
+    }}
+
+
+def bench_api(duration=API_DURATION):
+    import app
+
+    # Jangan jalankan refresher; snapshot dibuat langsung di sini
+    app._refresher_thread = threading.current_thread()
+    reset_state()
+    app._write_snapshot(scraper.collect_news(), time.time())
+    client = app.app.test_client()
+
+    results = {}
+    for name, query, headers in API_SCENARIOS:
+        if headers is None:
+            etag = client.get("/api/news").headers["ETag"]
+            headers = {"If-None-Match": etag}
+        url = "/api/news" + query
+        n = 0
+        t0 = time.perf_counter()
+        deadline = t0 + duration
+        while time.perf_counter() < deadline:
+            client.get(url, headers=headers)
+            n += 1
+        results[f"api.{name}"] = {"rps": round(n / (time.perf_counter() - t0), 1)}
+    return results
+
+
+# ─── Baseline & regresi ───
+
+def _flatten(results):
+    """{"nama.ms": nilai, ...} — hanya metrik yang dibandingkan dengan baseline."""
+    flat = {}
+    for name, values in results.items():
+        for key in ("ms", "peak_kib", "rps"):
+            if key in values:
+                flat[f"{name}.{key}"] = values[key]
+    return flat
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """[(metrik, baseline, sekarang, perubahan relatif)] yang lebih buruk dari threshold."""
+    current, base = _flatten(results), _flatten(baseline)
+    regressions = []
+    for key, now in current.items():
+        old = base.get(key)
+        if not old:
+            continue
+        # rps: makin besar makin baik; ms / KiB: makin kecil makin baik
+        change = (old - now) / old if key.endswith(".rps") else (now - old) / old
+        if change > threshold:
+            regressions.append((key, old, now, change))
+    return regressions
+
+
+def report(results, regressions, threshold, out=sys.stdout):
+    print(f"{'metrik':<48} {'nilai':>12}", file=out)
+    for key, value in sorted(_flatten(results).items()):
+        print(f"{key:<48} {value:>12}", file=out)
+    if regressions:
+        print(f"\nREGRESI (> {threshold:.0%} lebih buruk dari baseline):", file=out)
+        for key, old, now, change in regressions:
+            print(f"  {key:<46} {old} → {now} ({change:+.0%})", file=out)
+    else:
+        print(f"\nTidak ada regresi (threshold {threshold:.0%}).", file=out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline scraper & API")
+    parser.add_argument("--fixtures", default=FIXTURE_DIR, help="direktori fixture")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="file baseline JSON")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="simpan hasil sebagai baseline baru")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="batas regresi relatif (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=PARSE_REPEAT,
+                        help="pengulangan per halaman untuk waktu parse")
+    parser.add_argument("--runs", type=int, default=E2E_RUNS,
+                        help="putaran get_all_news")
+    parser.add_argument("--duration", type=float, default=API_DURATION,
+                        help="detik per skenario /api/news")
+    parser.add_argument("--json", help="tulis hasil lengkap ke file JSON")
+    parser.add_argument("--report", help="tulis laporan teks ke file (default stdout)")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest(args.fixtures)
+    server, urls = serve(manifest, args.fixtures)
+    rewrite_sources(urls)
+    # Fixture tidak bertambah baru → jangan sampai feed dianggap basi,
+    # dan gambar tidak divalidasi ke situs asli
+    scraper.FEED_MAX_AGE = math.inf
+    scraper.RESOLVE_IMAGES = False
+    # Semua fixture dilayani satu host lokal → jangan kena batas laju per host
+    fetcher.HOST_RATES["127.0.0.1"] = (1e6, 1e6)
+
+    # Log scraper tidak ikut mengganggu laporan
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        try:
+            results.update(bench_parse(manifest, args.fixtures, args.repeat))
+            results.update(bench_pipeline(args.runs))
+            results.update(bench_api(args.duration))
+        finally:
+            server.shutdown()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+
+    payload = {"created_at": time.time(), "python": sys.version.split()[0], "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        print(f"Baseline disimpan: {args.baseline}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            report(results, regressions, args.threshold, f)
+    report(results, regressions, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# changes.py — Diff antar snapshot untuk push (SSE) dan long-poll
+#
+# Setiap kali worker melihat snapshot baru, pool artikelnya dibandingkan
+# dengan snapshot sebelumnya (per link): artikel yang bertambah dan link
+# yang hilang disimpan di riwayat pendek. Subscriber cukup menerima diff,
+# bukan seluruh daftar.
+#
+# Token = fetched_at snapshot (sebagai string), sama di semua worker karena
+# snapshot dibagi lewat snapshot.py — klien boleh pindah worker.
+import threading
+from collections import deque
+
+# Jumlah diff terakhir yang disimpan; token yang lebih tua → reset
+HISTORY = 30
+
+
+def token_of(snap) -> str:
+    return repr(float(snap.get("fetched_at") or 0)) if snap else ""
+
+
+def _pool(snap):
+    return snap.get("pool") or snap.get("articles") or []
+
+
+class ChangeFeed:
+    def __init__(self, history=HISTORY):
+        self._cond = threading.Condition()
+        self._snap = None
+        self._token = ""
+        self._by_link = {}
+        self._history = deque(maxlen=history)   # (token_lama, token_baru, added, removed)
+
+    @property
+    def token(self):
+        return self._token
+
+    def observe(self, snap):
+        """Catat snapshot; kalau berbeda dari sebelumnya, hitung diff & bangunkan subscriber."""
+        if snap is None or snap is self._snap:
+            return
+        token = token_of(snap)
+        by_link = {art["link"]: art for art in _pool(snap)}
+        with self._cond:
+            if snap is self._snap or token == self._token:
+                self._snap = snap
+                return
+            if self._snap is not None:
+                added = [art for link, art in by_link.items() if link not in self._by_link]
+                removed = [link for link in self._by_link if link not in by_link]
+                self._history.append((self._token, token, added, removed))
+            self._snap, self._token, self._by_link = snap, token, by_link
+            self._cond.notify_all()
+
+    def changes_since(self, token):
+        """
+        Diff gabungan dari `token` sampai snapshot sekarang:
+        {"token", "reset", "added", "removed"}. Kalau token tidak dikenal
+        (terlalu lama / kosong), reset=True dan `added` = seluruh pool.
+        """
+        with self._cond:
+            current = self._token
+            if token == current:
+                return {"token": current, "reset": False, "added": [], "removed": []}
+            steps = []
+            found = False
+            for old, new, added, removed in self._history:
+                if old == token:
+                    found = True
+                if found:
+                    steps.append((added, removed))
+            if not found:
+                return {
+                    "token"  : current,
+                    "reset"  : True,
+                    "added"  : list(self._by_link.values()),
+                    "removed": [],
+                }
+        # Gabungkan beberapa langkah: yang ditambah lalu dihapus tidak dikirim
+        added, removed = {}, set()
+        for step_added, step_removed in steps:
+            for art in step_added:
+                added[art["link"]] = art
+                removed.discard(art["link"])
+            for link in step_removed:
+                if added.pop(link, None) is None:
+                    removed.add(link)
+        return {"token": current, "reset": False, "added": list(added.values()), "removed": sorted(removed)}
+
+    def wait(self, token, timeout):
+        """Tunggu sampai token sekarang berbeda dari `token` (atau timeout). True kalau berubah."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._token != token, timeout=timeout)
@@ -0,0 +1,135 @@
+# clusters.py — Kelompokkan berita yang sama dari sumber berbeda
+#
+# Judul dinormalisasi (textutil.tokenize) jadi himpunan kata, diringkas
+# dengan MinHash, lalu dimasukkan ke index LSH (BANDS pita × ROWS baris).
+# Artikel baru hanya dibandingkan dengan kandidat yang jatuh di bucket
+# yang sama — tidak dengan seluruh pool — dan dianggap satu cerita kalau
+# kemiripan Jaccard judulnya >= SIMILARITY.
+#
+# Index bersifat inkremental dan hidup lintas refresh; artikel yang lebih
+# tua dari MAX_AGE dibuang otomatis.
+import hashlib
+import threading
+import time
+from collections import deque
+
+from article import Article
+from textutil import tokenize
+
+BANDS      = 21
+ROWS       = 3
+NUM_PERM   = BANDS * ROWS
+SIMILARITY = 0.5
+MIN_TOKENS = 3             # judul lebih pendek dari ini tidak dikelompokkan
+MAX_AGE    = 48 * 3600     # detik
+
+_PRIME = (1 << 61) - 1
+
+
+def _perm_params():
+    params = []
+    for i in range(NUM_PERM):
+        digest = hashlib.blake2b(f"minhash-{i}".encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "little") % (_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:], "little") % _PRIME
+        params.append((a, b))
+    return tuple(params)
+
+
+_PERMS = _perm_params()
+
+
+def _hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+
+
+def signature(tokens) -> tuple:
+    hashes = [_hash(t) for t in tokens]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def _jaccard(x: frozenset, y: frozenset) -> float:
+    if not x or not y:
+        return 0.0
+    return len(x & y) / len(x | y)
+
+
+def _cluster_id(link: str) -> str:
+    return hashlib.blake2b(link.encode(), digest_size=6).hexdigest()
+
+
+class StoryIndex:
+    def __init__(self, max_age=MAX_AGE):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._buckets = [{} for _ in range(BANDS)]   # band → {kunci pita: set(link)}
+        self._items = {}                             # link → (tokens, bands, cluster, waktu)
+        self._order = deque()                        # (waktu, link) untuk eviction
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, link: str, title: str, now=None) -> str:
+        """Masukkan artikel (idempoten per link); kembalikan id cluster-nya."""
+        now = time.time() if now is None else now
+        with self._lock:
+            item = self._items.get(link)
+            if item is not None:
+                return item[2]
+            self._evict(now)
+
+            tokens = frozenset(tokenize(title))
+            if len(tokens) < MIN_TOKENS:
+                self._items[link] = (tokens, (), _cluster_id(link), now)
+                self._order.append((now, link))
+                return self._items[link][2]
+
+            sig = signature(tokens)
+            bands = tuple(hash(sig[i * ROWS:(i + 1) * ROWS]) for i in range(BANDS))
+            candidates = set()
+            for bucket, key in zip(self._buckets, bands):
+                candidates.update(bucket.get(key, ()))
+
+            best, best_score = None, SIMILARITY
+            for other in candidates:
+                score = _jaccard(tokens, self._items[other][0])
+                if score >= best_score:
+                    best, best_score = other, score
+            cluster = self._items[best][2] if best else _cluster_id(link)
+
+            for bucket, key in zip(self._buckets, bands):
+                bucket.setdefault(key, set()).add(link)
+            self._items[link] = (tokens, bands, cluster, now)
+            self._order.append((now, link))
+            return cluster
+
+    def _evict(self, now):
+        while self._order and now - self._order[0][0] > self.max_age:
+            _, link = self._order.popleft()
+            item = self._items.pop(link, None)
+            if not item:
+                continue
+            for bucket, key in zip(self._buckets, item[1]):
+                members = bucket.get(key)
+                if members:
+                    members.discard(link)
+                    if not members:
+                        del bucket[key]
+
+    def group(self, articles) -> list:
+        """
+        Satu artikel per cerita (yang pertama di `articles` jadi wakil).
+        Setiap wakil diberi field `cluster` dan `related` berisi sumber &
+        link lain untuk cerita yang sama. Artikel input tidak diubah.
+        """
+        reps = {}
+        out = []
+        for art in articles:
+            cid = self.add(art["link"], art["title"])
+            rep = reps.get(cid)
+            if rep is None:
+                rep = reps[cid] = Article.of(art).replace(cluster=cid, related=[])
+                out.append(rep)
+            else:
+                rep["related"].append({"source": art["source"], "link": art["link"]})
+        return out
@@ -0,0 +1,33 @@
+# codec.py — Encode / decode JSON; orjson kalau terpasang
+#
+# orjson langsung menghasilkan bytes UTF-8 dan beberapa kali lebih cepat
+# dari json standar. Tanpa orjson, dipakai json dengan output yang sama
+# (ringkas, ensure_ascii=False). Objek dengan to_dict() (article.Article)
+# di-encode lewat method itu.
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"tidak bisa di-encode ke JSON: {type(obj).__name__}")
+    return to_dict()
+
+
+def dumps(obj) -> bytes:
+    """Objek → JSON ringkas (bytes UTF-8)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data):
+    """JSON (bytes / str) → objek Python."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
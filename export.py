@@ -0,0 +1,197 @@
+# export.py — Ekspor snapshot statis news.json (untuk CDN / GitHub Pages)
+#
+# Mode batch: scrape sekali, bangun news.json dengan bentuk
+#   {"last_update", "version", "categories": [{"id", "title", "items": [...]}]}
+# lalu tulis ke direktori output. Dijalankan dari cron / CI, sehingga
+# pembaca cukup dilayani hosting statis tanpa proses Flask.
+#
+# Yang ditulis (semua atomik: file sementara + os.replace):
+#   news-<version>.json (+ .gz / .br)   → versi immutable, boleh di-cache lama
+#   news.json           (+ .gz / .br)   → versi terbaru, ditulis paling akhir
+# <version> = hash isi (tanpa last_update). Kalau sama dengan news.json
+# yang sudah ada, tidak ada file yang ditulis ulang. File .br butuh paket
+# brotli (requirements.txt); tanpa itu hanya .json & .gz yang ditulis.
+#
+# Pemakaian:
+#   python export.py [--out DIR] [--per-category N] [--keep N]
+import argparse
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import codec
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_OUT  = os.path.dirname(os.path.abspath(__file__))
+FILENAME     = "news.json"
+PER_CATEGORY = 30      # item maksimal per kategori
+KEEP         = 10      # jumlah file versi lama yang disimpan
+
+GZIP_LEVEL   = 9       # offline → pakai kompresi maksimum
+BROTLI_LEVEL = 11
+
+CATEGORIES = (
+    ("nasional", "Nasional"),
+    ("internasional", "Internasional"),
+)
+
+ITEM_FIELDS = ("source", "icon", "title", "link", "image")
+
+
+def build_categories(articles, per_category=PER_CATEGORY, icon=None) -> list:
+    """Daftar artikel (datar) → categories[].items[] seperti news.json."""
+    from scraper import rank_articles
+    if icon is None:
+        from scraper import source_icon as icon
+    known = dict(CATEGORIES)
+    by_cat = {}
+    for art in articles:
+        by_cat.setdefault(art.get("category") or "nasional", []).append(art)
+    order = [c for c in known if c in by_cat] + [c for c in by_cat if c not in known]
+
+    categories = []
+    for cat in order:
+        items = []
+        for art in rank_articles(by_cat[cat])[:per_category]:
+            item = {f: art.get(f, "") for f in ITEM_FIELDS}
+            item["icon"] = icon(art["source"])
+            items.append(item)
+        categories.append({"id": cat, "title": known.get(cat, cat.title()), "items": items})
+    return categories
+
+
+def content_version(categories) -> str:
+    canonical = json.dumps(categories, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def encode(payload) -> bytes:
+    return codec.dumps(payload)
+
+
+def current_version(out_dir) -> str:
+    """`version` dari news.json yang sudah ada di out_dir, atau ""."""
+    try:
+        with open(os.path.join(out_dir, FILENAME), "rb") as f:
+            return json.loads(f.read()).get("version", "")
+    except (OSError, ValueError, AttributeError):
+        return ""
+
+
+def _write_atomic(path, data: bytes):
+    fd, tmp = tempfile.mkstemp(prefix=".export-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _variants(body: bytes):
+    """(akhiran nama file, isi): identity, gzip, dan brotli kalau terpasang."""
+    yield "", body
+    yield ".gz", gzip.compress(body, GZIP_LEVEL, mtime=0)
+    if brotli:
+        yield ".br", brotli.compress(body, quality=BROTLI_LEVEL)
+
+
+def _prune(out_dir, keep):
+    stem, ext = os.path.splitext(FILENAME)
+    versions = sorted(
+        glob.glob(os.path.join(out_dir, f"{stem}-*{ext}")),
+        key=os.path.getmtime, reverse=True,
+    )
+    for path in versions[keep:]:
+        for suffix in ("", ".gz", ".br"):
+            try:
+                os.unlink(path + suffix)
+            except OSError:
+                pass
+
+
+def write_snapshot(out_dir, categories, keep=KEEP, now=None):
+    """
+    Tulis news.json bila isinya berubah. Mengembalikan versi yang ditulis,
+    atau None kalau isi sama dengan news.json yang sudah ada.
+    """
+    version = content_version(categories)
+    if version == current_version(out_dir):
+        return None
+
+    now = time.time() if now is None else now
+    payload = {
+        "last_update": datetime.fromtimestamp(now).isoformat(),
+        "version"    : version,
+        "categories" : categories,
+    }
+    body = encode(payload)
+    stem, ext = os.path.splitext(FILENAME)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # File versi dulu, news.json terakhir → yang menunjuk versi baru
+    # tidak pernah muncul sebelum versinya lengkap
+    variants = list(_variants(body))
+    for suffix, data in variants:
+        _write_atomic(os.path.join(out_dir, f"{stem}-{version}{ext}{suffix}"), data)
+    for suffix, data in variants:
+        _write_atomic(os.path.join(out_dir, FILENAME + suffix), data)
+    _prune(out_dir, keep)
+    return version
+
+
+def export(out_dir=DEFAULT_OUT, per_category=PER_CATEGORY, keep=KEEP, deadline=None):
+    """Scrape semua sumber lalu tulis snapshot. Mengembalikan versi atau None."""
+    from scraper import collect_news, group_stories, shutdown
+
+    try:
+        # Tidak ada refresh berikutnya yang memakai hasil lookup gambar yang
+        # terlambat → tunggu semuanya, lalu kosongkan antrian pool sebelum keluar
+        articles = group_stories(collect_news(deadline, wait_images=True))
+    finally:
+        shutdown()
+    if not articles:
+        raise RuntimeError("tidak ada artikel — news.json lama dibiarkan")
+    return write_snapshot(out_dir, build_categories(articles, per_category), keep)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor news.json statis")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="direktori output")
+    parser.add_argument("--per-category", type=int, default=PER_CATEGORY,
+                        help="item maksimal per kategori")
+    parser.add_argument("--keep", type=int, default=KEEP,
+                        help="jumlah file versi yang disimpan")
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="batas waktu scrape (detik)")
+    args = parser.parse_args(argv)
+
+    try:
+        version = export(args.out, args.per_category, args.keep, args.deadline)
+    except RuntimeError as e:
+        print(f"Ekspor gagal: {e}")
+        return 1
+    if version is None:
+        print("Isi tidak berubah, news.json tidak ditulis ulang.")
+    else:
+        print(f"news.json ditulis (versi {version}) → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
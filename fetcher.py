@@ -0,0 +1,315 @@
+# fetcher.py — Lapisan HTTP bersama untuk semua scraper
+#
+# - Satu requests.Session (connection pool keep-alive) per host
+#   → tidak ada TCP/TLS handshake baru setiap refresh
+# - Batas request bersamaan per host (PER_HOST_LIMIT)
+# - Conditional GET: kirim If-None-Match / If-Modified-Since,
+#   server menjawab 304 kalau halaman belum berubah
+# - Body dibaca & di-dekompresi (gzip/deflate) per potongan (stream);
+#   fetch_stream() membiarkan pemanggil berhenti membaca di tengah jalan
+# - Setiap Page membawa timing-nya (TTFB, lama & jumlah byte download)
+#   untuk metrik per sumber (lihat scraper.py / metrics.py)
+# - Laju request per host dijaga token bucket (HOST_RATE / HOST_BURST);
+#   jawaban 429 / 503 (dengan atau tanpa Retry-After) menahan host itu
+#   saja — host lain tetap jalan paralel
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import metrics
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+TIMEOUT = 12  # detik
+
+# Jumlah request bersamaan ke satu host yang sama
+PER_HOST_LIMIT = 2
+
+# Ukuran potongan saat membaca body, dan batas maksimal body (byte)
+CHUNK_SIZE = 64 * 1024
+MAX_BODY   = 8 * 1024 * 1024
+
+# Token bucket per host: rata-rata HOST_RATE request/detik, boleh
+# HOST_BURST request beruntun. HOST_RATES menimpa nilai untuk host tertentu:
+#   {"www.kompas.com": (0.5, 1)}
+HOST_RATE  = 4.0
+HOST_BURST = 4
+HOST_RATES = {}
+
+# 429 / 503: host ditahan selama Retry-After (dibatasi MAX_RETRY_AFTER),
+# atau DEFAULT_RETRY_AFTER kalau header tidak ada / tidak bisa dibaca
+THROTTLE_STATUS     = (429, 503)
+DEFAULT_RETRY_AFTER = 30    # detik
+MAX_RETRY_AFTER     = 600   # detik
+
+_M_WAIT = metrics.Counter(
+    "packnews_fetch_throttle_seconds_total", "Waktu menunggu token bucket per host", ("host",),
+)
+_M_THROTTLED = metrics.Counter(
+    "packnews_fetch_throttled_total", "Jawaban 429 / 503 per host", ("host", "status"),
+)
+
+
+class RateLimited(Exception):
+    """Host sedang ditahan (Retry-After) lebih lama dari timeout request."""
+
+
+class Page:
+    """
+    Hasil fetch satu URL.
+
+    ttfb     : detik sampai header response diterima (termasuk DNS /
+               connect kalau koneksi baru), dari requests `elapsed`
+    download : detik menunggu potongan body dari jaringan
+    nbytes   : byte body yang dibaca (setelah dekompresi)
+    """
+
+    __slots__ = ("url", "status", "body", "etag", "last_modified", "ttfb", "download", "nbytes")
+
+    def __init__(self, url, status, body=b"", etag=None, last_modified=None):
+        self.url           = url
+        self.status        = status
+        self.body          = body
+        self.etag          = etag
+        self.last_modified = last_modified
+        self.ttfb          = 0.0
+        self.download      = 0.0
+        self.nbytes        = 0
+
+    @property
+    def not_modified(self):
+        return self.status == 304
+
+
+class HostBucket:
+    """Token bucket satu host, ditambah penahanan sampai `blocked_until`."""
+
+    def __init__(self, rate=HOST_RATE, burst=HOST_BURST):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None) -> float:
+        """
+        Ambil satu token; kembalikan berapa detik pemanggil harus menunggu
+        sebelum mengirim request. RateLimited kalau lebih dari `max_wait`
+        (token tidak diambil).
+        """
+        with self._lock:
+            now = time.monotonic()
+            # `updated` bisa di masa depan kalau sudah ada yang antre
+            start = max(now, self.blocked_until, self.updated)
+            tokens = min(self.burst, self.tokens + (start - self.updated) * self.rate)
+            ready = start if tokens >= 1 else start + (1 - tokens) / self.rate
+            wait = ready - now
+            if max_wait is not None and wait > max_wait:
+                raise RateLimited(f"perlu menunggu {wait:.1f}s (maks. {max_wait:.1f}s)")
+            self.tokens = max(0.0, tokens - 1) if tokens >= 1 else 0.0
+            self.updated = max(start, ready)
+            return wait
+
+    def block(self, seconds):
+        """Tahan host ini `seconds` detik dari sekarang (tidak memperpendek yang sudah ada)."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_sessions = {}
+_host_slots = {}
+_buckets = {}
+_lock = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).hostname or ""
+
+
+def _host_slot(url: str) -> threading.BoundedSemaphore:
+    """Semaphore per host → membatasi request bersamaan ke satu origin."""
+    host = _host(url)
+    with _lock:
+        slot = _host_slots.get(host)
+        if slot is None:
+            slot = _host_slots[host] = threading.BoundedSemaphore(PER_HOST_LIMIT)
+    return slot
+
+
+def _bucket(host: str) -> HostBucket:
+    with _lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            rate, burst = HOST_RATES.get(host, (HOST_RATE, HOST_BURST))
+            bucket = _buckets[host] = HostBucket(rate, burst)
+    return bucket
+
+
+def _throttle(url: str, timeout):
+    """Tunggu giliran host ini (token bucket / Retry-After), paling lama `timeout`."""
+    host = _host(url)
+    wait = _bucket(host).reserve(max_wait=timeout if isinstance(timeout, (int, float)) else None)
+    if wait > 0:
+        _M_WAIT.labels(host).inc(wait)
+        time.sleep(wait)
+
+
+def _retry_after(value) -> float:
+    """Header Retry-After (detik atau HTTP-date) → detik, dibatasi MAX_RETRY_AFTER."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return DEFAULT_RETRY_AFTER
+    return min(MAX_RETRY_AFTER, max(0.0, seconds))
+
+
+def _note_status(url: str, res):
+    """429 / 503 → tahan host sesuai Retry-After sebelum request berikutnya."""
+    if res.status_code in THROTTLE_STATUS:
+        host = _host(url)
+        _M_THROTTLED.labels(host, res.status_code).inc()
+        _bucket(host).block(_retry_after(res.headers.get("Retry-After")))
+
+
+def _session(url: str):
+    """Session keep-alive per host (dibuat sekali, dipakai ulang)."""
+    host = _host(url)
+    with _lock:
+        sess = _sessions.get(host)
+        if sess is None:
+            # requests di-import saat request pertama, bukan saat start
+            import requests
+            from requests.adapters import HTTPAdapter
+            sess = requests.Session()
+            sess.headers.update(HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PER_HOST_LIMIT)
+            sess.mount("https://", adapter)
+            sess.mount("http://", adapter)
+            _sessions[host] = sess
+    return sess
+
+
+def _iter_body(res, page):
+    """
+    Potongan body yang sudah di-dekompresi (urllib3, sambil jalan).
+    Waktu tunggu jaringan & jumlah byte dicatat di `page`.
+    """
+    stream = res.raw.stream(CHUNK_SIZE, decode_content=True)
+    while True:
+        t0 = time.perf_counter()
+        chunk = next(stream, None)
+        page.download += time.perf_counter() - t0
+        if chunk is None:
+            return
+        page.nbytes += len(chunk)
+        if page.nbytes > MAX_BODY:
+            raise ValueError(f"body lebih dari {MAX_BODY} byte: {res.url}")
+        yield chunk
+
+
+def _charset(content_type):
+    """charset dari header Content-Type, atau None (biar parser menebak)."""
+    for param in (content_type or "").split(";")[1:]:
+        key, _, value = param.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return value.strip().strip('"\'')
+    return None
+
+
+@contextmanager
+def _open(url, etag, last_modified, timeout):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    _throttle(url, timeout)
+    with _host_slot(url):
+        res = _session(url).get(url, headers=headers, timeout=timeout, stream=True)
+        _note_status(url, res)
+        try:
+            if res.status_code != 304:
+                res.raise_for_status()
+            yield res
+        finally:
+            _release(res)
+
+
+def _release(res):
+    """
+    Body kosong (304) atau sudah dibaca habis → koneksi kembali ke pool
+    untuk refresh berikutnya. Kalau body ditinggal di tengah jalan,
+    koneksinya ditutup — lebih murah daripada men-download sisanya.
+    """
+    if res.raw.length_remaining == 0:
+        res.raw.release_conn()
+    res.close()
+
+
+def _page(url, res, etag, last_modified):
+    if res.status_code == 304:
+        page = Page(url, 304, etag=etag, last_modified=last_modified)
+    else:
+        page = Page(
+            url,
+            res.status_code,
+            etag=res.headers.get("ETag"),
+            last_modified=res.headers.get("Last-Modified"),
+        )
+    page.ttfb = res.elapsed.total_seconds()
+    return page
+
+
+def fetch(url: str, etag=None, last_modified=None, timeout=TIMEOUT) -> Page:
+    """
+    GET satu URL lewat session pool host-nya.
+
+    Kalau `etag` / `last_modified` diberikan, request dikirim sebagai
+    conditional GET; jawaban 304 menghasilkan Page dengan body kosong
+    (cek `page.not_modified`). Status >= 400 dilempar sebagai HTTPError.
+    """
+    with _open(url, etag, last_modified, timeout) as res:
+        page = _page(url, res, etag, last_modified)
+        if not page.not_modified:
+            page.body = b"".join(_iter_body(res, page))
+        return page
+
+
+def fetch_stream(url: str, consume, etag=None, last_modified=None, timeout=TIMEOUT):
+    """
+    Seperti fetch(), tapi body tidak dikumpulkan: `consume(chunks, encoding)`
+    menerima iterator potongan body dan boleh berhenti kapan saja; sisa
+    response tidak dibaca. Mengembalikan (page, hasil consume) — hasil
+    consume None kalau server menjawab 304.
+    """
+    with _open(url, etag, last_modified, timeout) as res:
+        page = _page(url, res, etag, last_modified)
+        if page.not_modified:
+            return page, None
+        return page, consume(_iter_body(res, page), _charset(res.headers.get("Content-Type")))
+
+
+def head(url: str, timeout=TIMEOUT):
+    """HEAD satu URL (redirect diikuti) → (status, content-type)."""
+    _throttle(url, timeout)
+    with _host_slot(url):
+        res = _session(url).head(url, timeout=timeout, allow_redirects=True)
+        _note_status(url, res)
+        res.close()
+        return res.status_code, res.headers.get("Content-Type", "")
@@ -0,0 +1,87 @@
+# fulltext.py — Ambil isi artikel untuk index pencarian (lihat store.search)
+#
+# Artikel di store yang belum punya isi diambil halaman artikelnya di pool
+# thread terbatas (BODY_WORKERS), di belakang refresh — refresh tidak
+# pernah menunggu. Teks paragrafnya disimpan lewat store.set_body; tabel
+# `bodies` di store menjadi cache per link, jadi satu artikel diambil
+# sekali saja. Yang gagal disimpan kosong dan dicoba lagi setelah
+# RETRY_AFTER; yang ditolak batas laju host (fetcher.RateLimited) tidak
+# disimpan, ikut putaran berikutnya.
+#
+# Antrian dibatasi MAX_PENDING: sisa artikel (mis. seluruh riwayat saat
+# pertama kali dinyalakan) diambil bertahap di refresh-refresh berikutnya.
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fetcher import RateLimited, fetch
+from scraper import PARSER
+import metrics
+
+BODY_WORKERS  = 2
+MAX_PENDING   = 40
+BODY_TIMEOUT  = 10           # detik
+RETRY_AFTER   = 6 * 3600     # detik
+MAX_CHARS     = 20_000       # isi yang disimpan per artikel
+MIN_PARAGRAPH = 40           # paragraf lebih pendek (caption, "Baca juga") dilewati
+
+# Bagian halaman yang bukan isi berita
+_SKIP_TAGS = ("script", "style", "noscript", "nav", "header", "footer", "aside", "form", "figure")
+
+_M_BODIES = metrics.Counter(
+    "packnews_article_bodies_total", "Halaman artikel yang diambil untuk pencarian", ("result",),
+)
+
+
+def extract_text(body: bytes) -> str:
+    """HTML halaman artikel → teks paragraf isi berita (maks. MAX_CHARS)."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(body, PARSER)
+    for tag in soup(_SKIP_TAGS):
+        tag.decompose()
+    root = soup.find("article") or soup.body or soup
+    paragraphs = (" ".join(p.get_text(" ").split()) for p in root.find_all("p"))
+    return " ".join(p for p in paragraphs if len(p) >= MIN_PARAGRAPH)[:MAX_CHARS]
+
+
+class BodyFetcher:
+    def __init__(self, store, workers=BODY_WORKERS):
+        self._store = store
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="body")
+        self._lock = threading.Lock()
+        self._inflight = set()   # link yang sedang / akan diambil
+
+    def _fetch_one(self, link):
+        try:
+            text = extract_text(fetch(link, timeout=BODY_TIMEOUT).body)
+        except RateLimited:
+            text = None
+        except Exception as e:
+            print(f"  [body] gagal ambil {link[:60]}: {e}")
+            text = ""
+        try:
+            if text is None:
+                _M_BODIES.labels("throttled").inc()
+            else:
+                _M_BODIES.labels("ok" if text else "empty").inc()
+                self._store.set_body(link, text)
+        finally:
+            # Baru dilepas setelah tersimpan → schedule() tidak mengantrikannya lagi
+            with self._lock:
+                self._inflight.discard(link)
+
+    def schedule(self) -> int:
+        """Antrikan artikel yang belum punya isi (sampai MAX_PENDING); kembalikan jumlah yang ditambah."""
+        with self._lock:
+            room = MAX_PENDING - len(self._inflight)
+            busy = set(self._inflight)
+        if room <= 0:
+            return 0
+        links = [
+            link for link in self._store.without_body(room + len(busy), RETRY_AFTER)
+            if link not in busy
+        ][:room]
+        with self._lock:
+            self._inflight.update(links)
+        for link in links:
+            self._pool.submit(self._fetch_one, link)
+        return len(links)
@@ -0,0 +1,38 @@
+# gunicorn.conf.py — dibaca otomatis oleh: gunicorn app:app
+#
+# Default gthread: refresher, pool thread scraper / gambar / isi artikel,
+# dan SQLite berjalan sebagai thread sungguhan, jadi parse saat refresh
+# tidak menahan request yang sedang dilayani.
+#
+# WORKER_CLASS=gevent membuat setiap koneksi SSE (/api/news/stream) cukup
+# satu greenlet, tapi semua thread tadi ikut jadi greenlet: parse
+# BeautifulSoup / lxml / feedparser dan stemming isi artikel memblok hub,
+# dan request di worker leader macet selama refresh. Kalau tetap dipakai,
+# aktifkan juga PARSE_WORKERS supaya parse listing pindah ke proses lain.
+# Halaman hanya memakai SSE kalau server mengiklankannya (app.PUSH_SSE);
+# di gthread halaman mem-poll /api/news/changes. Klien yang memanggil
+# /api/news/stream atau ?wait= langsung juga tidak menahan thread: di
+# gthread keduanya langsung dijawab (lihat app.py), jadi THREADS tidak
+# habis oleh tab yang menganggur.
+import os
+
+bind    = os.environ.get("BIND", "0.0.0.0:" + os.environ.get("PORT", "8000"))
+workers = int(os.environ.get("WEB_CONCURRENCY", "2"))
+
+worker_class = os.environ.get("WORKER_CLASS", "gthread")
+if worker_class == "gevent":
+    worker_connections = int(os.environ.get("WORKER_CONNECTIONS", "2000"))
+else:
+    threads = int(os.environ.get("THREADS", "32"))
+
+# Koneksi SSE boleh hidup lama; worker dianggap hang hanya kalau heartbeat-nya macet
+timeout          = 60
+graceful_timeout = 30
+keepalive        = 5
+
+
+def post_worker_init(worker):
+    # Snapshot terakhir dimuat dari disk sebelum worker menerima request,
+    # refresher jalan di belakang → request pertama langsung dijawab
+    import app
+    app.warm_up()
@@ -0,0 +1,162 @@
+# health.py — Kesehatan per sumber: circuit breaker + timeout adaptif
+#
+# - Setelah FAILURE_THRESHOLD kegagalan berturut-turut, sumber dilewati
+#   (circuit "open") selama masa backoff yang berlipat setiap kali terbuka
+#   lagi, sampai MAX_BACKOFF. Setelah backoff habis satu percobaan
+#   diizinkan ("half_open"): sukses → normal lagi, gagal → open lagi.
+# - Timeout request per sumber = persentil latensi yang teramati
+#   dikali TIMEOUT_FACTOR, dibatasi MIN_TIMEOUT..MAX_TIMEOUT.
+# - Satu kali scrape dicatat lewat Run: kalau sudah dihitung gagal karena
+#   lewat deadline refresh, halaman yang selesai belakangan tidak lagi
+#   dicatat (sukses terlambat tidak me-reset hitungan kegagalan).
+import threading
+import time
+from collections import deque
+
+from fetcher import TIMEOUT
+
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF      = 60      # detik
+MAX_BACKOFF       = 30 * 60
+
+LATENCY_WINDOW     = 50     # jumlah sampel latensi terakhir yang disimpan
+MIN_SAMPLES        = 5      # sebelum ini, pakai DEFAULT_TIMEOUT
+LATENCY_PERCENTILE = 0.95
+TIMEOUT_FACTOR     = 3.0
+MIN_TIMEOUT        = 3.0
+MAX_TIMEOUT        = float(TIMEOUT)
+DEFAULT_TIMEOUT    = MAX_TIMEOUT
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+class SourceHealth:
+    """Status satu sumber. Aman dipakai dari banyak thread."""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.trips = 0            # berapa kali circuit sudah terbuka berturut-turut
+        self.open_until = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_error = None
+        self.last_success = None
+
+    def state(self, now=None):
+        now = time.time() if now is None else now
+        if self.open_until == 0:
+            return "closed"
+        return "open" if now < self.open_until else "half_open"
+
+    def allow(self) -> bool:
+        """False kalau circuit sedang open (sumber harus dilewati)."""
+        with self._lock:
+            if self.state() == "open":
+                self.skipped += 1
+                return False
+            return True
+
+    def timeout(self) -> float:
+        with self._lock:
+            if len(self._latencies) < MIN_SAMPLES:
+                return DEFAULT_TIMEOUT
+            p = _percentile(self._latencies, LATENCY_PERCENTILE)
+        return min(MAX_TIMEOUT, max(MIN_TIMEOUT, p * TIMEOUT_FACTOR))
+
+    def record_success(self, latency=None):
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.trips = 0
+            self.open_until = 0.0
+            self.last_success = time.time()
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self.last_error = str(error)
+            state = self.state()
+            if state == "open":
+                return  # sudah terbuka (mis. halaman kedua yang sedang jalan)
+            if state == "half_open" or self.consecutive_failures >= FAILURE_THRESHOLD:
+                backoff = min(MAX_BACKOFF, BASE_BACKOFF * (2 ** self.trips))
+                self.trips += 1
+                self.open_until = time.time() + backoff
+                print(f"  [{self.name}] circuit open {backoff}s: {error}")
+
+    def to_dict(self):
+        timeout = self.timeout()
+        with self._lock:
+            samples = list(self._latencies)
+            return {
+                "state"               : self.state(),
+                "open_until"          : self.open_until or None,
+                "consecutive_failures": self.consecutive_failures,
+                "successes"           : self.successes,
+                "failures"            : self.failures,
+                "skipped"             : self.skipped,
+                "last_error"          : self.last_error,
+                "last_success"        : self.last_success,
+                "latency_p50"         : round(_percentile(samples, 0.5), 3) if samples else None,
+                "latency_p95"         : round(_percentile(samples, 0.95), 3) if samples else None,
+                "timeout"             : round(timeout, 2),
+            }
+
+
+class Run:
+    """
+    Satu kali scrape satu sumber. Setelah expire() (lewat deadline,
+    dicatat sebagai satu kegagalan) hasil halaman berikutnya diabaikan.
+    """
+
+    def __init__(self, health):
+        self.health = health
+        self._lock = threading.Lock()
+        self.expired = False
+
+    def success(self, latency=None):
+        with self._lock:
+            if not self.expired:
+                self.health.record_success(latency)
+
+    def failure(self, error):
+        with self._lock:
+            if not self.expired:
+                self.health.record_failure(error)
+
+    def expire(self, error):
+        with self._lock:
+            if self.expired:
+                return
+            self.expired = True
+            self.health.record_failure(error)
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get(name) -> SourceHealth:
+    with _registry_lock:
+        h = _registry.get(name)
+        if h is None:
+            h = _registry[name] = SourceHealth(name)
+    return h
+
+
+def snapshot() -> dict:
+    """Status semua sumber, untuk API."""
+    with _registry_lock:
+        items = list(_registry.items())
+    return {name: h.to_dict() for name, h in items}
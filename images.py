@@ -0,0 +1,207 @@
+# images.py — Pilih, cari, dan validasi gambar artikel
+#
+# 1. Dari card: coba atribut yang dikonfigurasi + atribut lazy-load umum
+#    (data-src, data-lazy-src, data-original, srcset → resolusi terbesar),
+#    lewati placeholder lazy-load (pre-images-light.png, blank.gif, data:...).
+# 2. Artikel yang masih tanpa gambar asli: ambil og:image / twitter:image
+#    dari <head> halaman artikelnya (dibaca streaming, berhenti di </head>).
+# 3. Kandidat dicek dengan HEAD (status & Content-Type image/*).
+#
+# Langkah 2–3 berjalan di pool thread terbatas (IMAGE_WORKERS). resolve()
+# menunggu paling lama RESOLVE_DEADLINE; yang belum selesai tetap jalan di
+# belakang dan hasilnya dipakai refresh berikutnya. Hasil disimpan per
+# link artikel (TTL), jadi satu artikel tidak pernah di-resolve dua kali.
+# Proses batch (export.py) tidak punya refresh berikutnya: ia menunggu
+# semuanya (deadline=None) lalu memanggil shutdown().
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urljoin
+
+from article import Article
+from fetcher import fetch_stream, head
+
+IMAGE_WORKERS    = 4
+RESOLVE_DEADLINE = 8       # detik
+HEAD_TIMEOUT     = 5       # detik
+CACHE_TTL        = 6 * 3600
+NEGATIVE_TTL     = 30 * 60  # artikel yang tidak punya gambar valid
+CACHE_SIZE       = 5000
+MAX_HEAD_BYTES   = 256 * 1024
+
+# Atribut lazy-load yang dicoba setelah atribut dari registry sumber
+LAZY_ATTRS = ("data-src", "data-lazy-src", "data-original", "data-srcset", "srcset", "src")
+
+PLACEHOLDER_PATTERNS = (
+    "pre-images", "placeholder", "blank.", "spacer", "lazy-load", "lazyload",
+    "loading.", "/1x1", "transparent.", "default-image", "no-image", "noimage",
+)
+
+_META_RE = re.compile(r"<meta\b[^>]*>", re.I)
+_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""")
+_HEAD_END_RE = re.compile(rb"</head\s*>|<body\b", re.I)
+_OG_KEYS = ("og:image", "og:image:url", "og:image:secure_url", "twitter:image", "twitter:image:src")
+
+
+def is_placeholder(url: str) -> bool:
+    if not url or url.startswith("data:"):
+        return True
+    low = url.lower()
+    return any(p in low for p in PLACEHOLDER_PATTERNS)
+
+
+def _largest_from_srcset(value: str) -> str:
+    best, best_w = "", -1.0
+    for part in value.split(","):
+        bits = part.strip().split()
+        if not bits:
+            continue
+        width = 0.0
+        if len(bits) > 1 and bits[1][:-1].replace(".", "", 1).isdigit():
+            width = float(bits[1][:-1])
+        if width > best_w:
+            best, best_w = bits[0], width
+    return best
+
+
+def from_img(img, attrs, base_url, abs_url) -> str:
+    """Kandidat gambar terbaik dari elemen <img> (bs4 Tag / lxml), atau ""."""
+    tried = set()
+    for attr in tuple(attrs) + LAZY_ATTRS:
+        if attr in tried:
+            continue
+        tried.add(attr)
+        value = (img.get(attr) or "").strip()
+        if not value:
+            continue
+        if attr.endswith("srcset"):
+            value = _largest_from_srcset(value)
+        url = abs_url(base_url, value)
+        if not is_placeholder(url):
+            return url
+    return ""
+
+
+def _og_image(page_url: str) -> str:
+    """og:image dari <head> halaman artikel; berhenti membaca di </head>."""
+    def consume(chunks, encoding):
+        buf = b""
+        for chunk in chunks:
+            buf += chunk
+            if _HEAD_END_RE.search(buf) or len(buf) > MAX_HEAD_BYTES:
+                break
+        return buf.decode(encoding or "utf-8", "replace")
+
+    _, head_html = fetch_stream(page_url, consume, timeout=HEAD_TIMEOUT)
+    found = {}
+    for tag in _META_RE.findall(head_html or ""):
+        attrs = {m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or "" for m in _ATTR_RE.finditer(tag)}
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        if key in _OG_KEYS and attrs.get("content"):
+            found.setdefault(key, attrs["content"].strip())
+    for key in _OG_KEYS:
+        if key in found:
+            return urljoin(page_url, found[key])
+    return ""
+
+
+def _valid(url: str) -> bool:
+    if is_placeholder(url):
+        return False
+    try:
+        status, ctype = head(url, timeout=HEAD_TIMEOUT)
+    except Exception:
+        return False
+    if status == 405:   # server tidak melayani HEAD → anggap valid
+        return True
+    return status < 400 and (not ctype or ctype.lower().startswith("image/"))
+
+
+class ImageResolver:
+    def __init__(self, workers=IMAGE_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image")
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()   # link → (image atau "", kadaluarsa)
+        self._inflight = {}           # link → Future
+
+    def cached(self, link):
+        with self._lock:
+            entry = self._cache.get(link)
+            if entry is None:
+                return None
+            if entry[1] < time.time():
+                del self._cache[link]
+                return None
+            self._cache.move_to_end(link)
+            return entry[0]
+
+    def _store(self, link, image):
+        ttl = CACHE_TTL if image else NEGATIVE_TTL
+        with self._lock:
+            self._cache[link] = (image, time.time() + ttl)
+            self._cache.move_to_end(link)
+            while len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+            self._inflight.pop(link, None)
+
+    def _resolve_one(self, link, card_image):
+        image = ""
+        try:
+            if card_image and _valid(card_image):
+                image = card_image
+            else:
+                og = _og_image(link)
+                if og and _valid(og):
+                    image = og
+        except Exception as e:
+            print(f"  [image] gagal resolve {link[:60]}: {e}")
+        self._store(link, image)
+        return image
+
+    def _submit(self, link, card_image):
+        with self._lock:
+            fut = self._inflight.get(link)
+            if fut is None:
+                fut = self._inflight[link] = self._pool.submit(self._resolve_one, link, card_image)
+        return fut
+
+    def shutdown(self):
+        """Batalkan lookup yang masih antre; resolver tidak dipakai lagi sesudahnya."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def resolve(self, articles, fallback, placeholders=(), deadline=RESOLVE_DEADLINE):
+        """
+        Daftar artikel baru dengan `image` yang sudah divalidasi. Yang
+        belum selesai dalam `deadline` memakai gambar dari card (atau
+        fallback(source)) dulu; deadline=None menunggu semuanya.
+        Artikel input tidak diubah.
+        """
+        pending = {}
+        results = {}
+        for art in articles:
+            link = art["link"]
+            hit = self.cached(link)
+            if hit is not None:
+                results[link] = hit
+                continue
+            card_image = art.get("image", "")
+            if card_image in placeholders:
+                card_image = ""
+            pending[link] = self._submit(link, card_image)
+
+        if pending:
+            wait(pending.values(), timeout=deadline)
+            for link, fut in pending.items():
+                if fut.done() and not fut.exception():
+                    results[link] = fut.result()
+
+        out = []
+        for art in articles:
+            image = results.get(art["link"])
+            if image is None:   # belum selesai → pakai yang ada dulu
+                image = "" if is_placeholder(art.get("image", "")) else art.get("image", "")
+            image = image or fallback(art["source"])
+            out.append(art if image == art.get("image") else Article.of(art).replace(image=image))
+        return out
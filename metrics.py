@@ -0,0 +1,333 @@
+# metrics.py — Registry metrik kecil dengan output format teks Prometheus
+#
+# Counter, Gauge, dan Histogram dengan label. Nilai disimpan per proses
+# (di memori) dan dirender oleh endpoint /metrics. Biaya per observasi:
+# satu lookup dict + satu lock, jadi aman dipanggil di jalur panas.
+#
+#   FETCHES = metrics.Counter("packnews_x_total", "Penjelasan", ("source",))
+#   FETCHES.labels("Kompas").inc()
+#   with LATENCY.labels("Kompas").time(): ...
+#
+# Dengan gunicorn setiap worker punya registry sendiri, dan metrik refresh
+# hanya terisi di worker leader. Supaya satu scrape /metrics melihat semua
+# worker, thread kecil di setiap proses (start_flusher) menulis counter &
+# histogram-nya ke <MULTIPROC_DIR>/<pid>.json setiap FLUSH_INTERVAL kalau
+# ada yang berubah, dan render() menjumlahkan file proses lain dengan
+# nilai proses sendiri. Gauge tidak dijumlah: nilainya dihitung dari
+# snapshot bersama saat /metrics dipanggil, jadi sama di semua worker.
+#
+# File milik proses yang sudah mati dihapus saat render — counter-nya
+# turun seperti restart biasa, yang ditangani rate() / increase().
+#
+# Lokasi lewat environment METRICS_DIR (default: <tmp>/packnews-metrics);
+# METRICS_DIR kosong → hanya metrik proses ini.
+import bisect
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Bucket default (detik) — dari request cepat sampai timeout fetch
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+MULTIPROC_DIR  = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), "packnews-metrics"))
+FLUSH_INTERVAL = 1.0   # detik
+
+_registry = []
+_registry_lock = threading.Lock()
+_flushed = None          # isi file terakhir yang ditulis proses ini
+_flusher_thread = None
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _label_str(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs.extend(f'{n}="{_escape(v)}"' for n, v in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, doc, labelnames=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children = {}
+        with _registry_lock:
+            _registry.append(self)
+
+    def labels(self, *values):
+        """Anak metrik untuk kombinasi label ini (dibuat sekali, dipakai ulang)."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: butuh label {self.labelnames}, dapat {values}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def clear(self):
+        with self._lock:
+            self._children = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _values(self) -> dict:
+        """Nilai proses ini: tuple label (str) → nilai yang bisa di-JSON-kan."""
+        raise NotImplementedError
+
+    def _add(self, values, key, value):
+        """Tambahkan nilai dari proses lain ke `values`."""
+        raise NotImplementedError
+
+    def _samples(self, values):
+        raise NotImplementedError
+
+    def render(self, others=()) -> list:
+        values = self._values()
+        for dumped in others:
+            for key, value in dumped.get(self.name, ()):
+                self._add(values, tuple(key), value)
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples(values))
+        return lines
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self, lock):
+        self.value = 0.0
+        self._lock = lock
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = float(value)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value(self._lock)
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _values(self):
+        values = {}
+        for key, child in list(self._children.items()):
+            self._add(values, tuple(str(v) for v in key), child.value)
+        return values
+
+    def _add(self, values, key, value):
+        values[key] = values.get(key, 0.0) + value
+
+    def _samples(self, values):
+        return [
+            f"{self.name}{_label_str(self.labelnames, key)} {_format_value(value)}"
+            for key, value in values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value):
+        self.labels().set(value)
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "_lock")
+
+    def __init__(self, buckets, lock):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # slot terakhir = +Inf
+        self.sum = 0.0
+        self._lock = lock
+
+    def observe(self, value):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[idx] += 1
+            self.sum += value
+
+    @contextmanager
+    def time(self):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, doc, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets, self._lock)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _values(self):
+        values = {}
+        for key, child in list(self._children.items()):
+            with self._lock:
+                counts, total = list(child.counts), child.sum
+            self._add(values, tuple(str(v) for v in key), (counts, total))
+        return values
+
+    def _add(self, values, key, value):
+        counts, total = value
+        if len(counts) != len(self.buckets) + 1:
+            return   # bucket beda (versi kode lain) → tidak bisa dijumlah
+        mine = values.get(key)
+        if mine is not None:
+            counts = [a + b for a, b in zip(mine[0], counts)]
+            total += mine[1]
+        values[key] = (list(counts), total)
+
+    def _samples(self, values):
+        lines = []
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _label_str(self.labelnames, key, (("le", _format_value(float(bound))),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_str(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _metrics():
+    with _registry_lock:
+        return list(_registry)
+
+
+def _own_file():
+    return os.path.join(MULTIPROC_DIR, f"{os.getpid()}.json")
+
+
+def flush():
+    """Tulis counter & histogram proses ini ke MULTIPROC_DIR kalau berubah sejak flush terakhir."""
+    global _flushed
+    if not MULTIPROC_DIR:
+        return
+    body = json.dumps({
+        metric.name: [[list(key), value] for key, value in metric._values().items()]
+        for metric in _metrics() if metric.kind != "gauge"
+    }, separators=(",", ":"))
+    if body == _flushed:
+        return
+    try:
+        os.makedirs(MULTIPROC_DIR, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".metrics-", dir=MULTIPROC_DIR)
+        with os.fdopen(fd, "w") as f:
+            f.write(body)
+        os.replace(tmp, _own_file())
+    except OSError as e:
+        print(f"Metrik gagal ditulis ke {MULTIPROC_DIR}: {e}")
+        return
+    _flushed = body
+
+
+def _flusher_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL)
+        try:
+            flush()
+        except Exception as e:
+            print(f"Flush metrik gagal: {e}")
+
+
+def start_flusher():
+    """Jalankan thread flush (sekali per proses; tanpa MULTIPROC_DIR tidak ada apa-apa)."""
+    global _flusher_thread
+    if not MULTIPROC_DIR or _flusher_thread is not None:
+        return
+    with _registry_lock:
+        if _flusher_thread is None:
+            _flusher_thread = threading.Thread(target=_flusher_loop, name="metrics-flush", daemon=True)
+            _flusher_thread.start()
+
+
+def _alive(pid) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _other_processes() -> list:
+    """Isi file metrik proses lain yang masih hidup; file proses mati dihapus."""
+    if not MULTIPROC_DIR:
+        return []
+    try:
+        names = os.listdir(MULTIPROC_DIR)
+    except OSError:
+        return []
+    dumped = []
+    for name in names:
+        pid, ext = os.path.splitext(name)
+        if ext != ".json" or not pid.isdigit() or int(pid) == os.getpid():
+            continue
+        path = os.path.join(MULTIPROC_DIR, name)
+        if not _alive(int(pid)):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path) as f:
+                dumped.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return dumped
+
+
+def render() -> str:
+    """Semua metrik terdaftar dalam format teks Prometheus, dijumlah dari semua worker."""
+    others = _other_processes()
+    lines = []
+    for metric in _metrics():
+        lines.extend(metric.render(others))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,103 @@
+# newsindex.py — Index artikel per snapshot untuk query /api/news
+#
+# Dibangun SEKALI setiap snapshot berganti, lalu dipakai semua request:
+#   - urutan tetap: first_seen terbaru dulu, link sebagai tie-breaker
+#   - daftar posisi per kategori, per sumber, dan per (kategori, sumber)
+# Filter, cursor, dan `since` cukup memotong daftar yang sudah jadi.
+import base64
+import json
+from bisect import bisect_left, bisect_right
+
+# Field yang boleh diminta lewat ?fields=
+FIELDS = (
+    "source", "title", "link", "image", "category",
+    "first_seen", "last_seen", "cluster", "related",
+)
+
+DEFAULT_LIMIT = 18
+MAX_LIMIT     = 100
+
+
+def _sort_key(art):
+    return (-(art.get("first_seen") or 0), art["link"])
+
+
+def encode_cursor(art) -> str:
+    raw = json.dumps([art.get("first_seen") or 0, art["link"]], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Cursor → sort key; ValueError kalau cursor tidak valid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        first_seen, link = json.loads(base64.urlsafe_b64decode(padded))
+        return (-float(first_seen), str(link))
+    except Exception:
+        raise ValueError("cursor tidak valid")
+
+
+def parse_fields(value):
+    """'title,link' → tuple field; None kalau kosong. ValueError kalau tidak dikenal."""
+    if not value:
+        return None
+    fields = tuple(f.strip() for f in value.split(",") if f.strip())
+    unknown = [f for f in fields if f not in FIELDS]
+    if unknown:
+        raise ValueError(f"field tidak dikenal: {', '.join(unknown)} (pilih: {', '.join(FIELDS)})")
+    return fields
+
+
+def project(articles, fields):
+    if not fields:
+        return articles
+    return [{f: art.get(f) for f in fields} for art in articles]
+
+
+class NewsIndex:
+    def __init__(self, articles):
+        self.articles = sorted(articles, key=_sort_key)
+        self.keys = [_sort_key(a) for a in self.articles]
+        self.by_category = {}
+        self.by_source = {}
+        self.by_pair = {}
+        for pos, art in enumerate(self.articles):
+            cat, src = art.get("category", ""), art.get("source", "")
+            self.by_category.setdefault(cat, []).append(pos)
+            self.by_source.setdefault(src, []).append(pos)
+            self.by_pair.setdefault((cat, src), []).append(pos)
+        self._all = list(range(len(self.articles)))
+
+    def _positions(self, category, source):
+        if category and source:
+            return self.by_pair.get((category, source), [])
+        if category:
+            return self.by_category.get(category, [])
+        if source:
+            return self.by_source.get(source, [])
+        return self._all
+
+    def query(self, category=None, source=None, since=None, cursor=None, limit=DEFAULT_LIMIT):
+        """
+        Mengembalikan (artikel, next_cursor). `since` (epoch) hanya
+        mengambil artikel dengan first_seen lebih baru; `cursor` melanjutkan
+        dari halaman sebelumnya (stabil walau snapshot sudah berganti).
+        """
+        positions = self._positions(category, source)
+        start = 0
+        if cursor:
+            # posisi global pertama yang key-nya > cursor, lalu cari di subset
+            boundary = bisect_right(self.keys, decode_cursor(cursor))
+            start = bisect_left(positions, boundary)
+        limit = max(1, min(MAX_LIMIT, limit))
+        out = []
+        for p in positions[start:]:
+            art = self.articles[p]
+            if since is not None and (art.get("first_seen") or 0) <= since:
+                break  # urutan first_seen menurun → sisanya lebih tua
+            out.append(art)
+            if len(out) > limit:
+                break
+        more = len(out) > limit
+        out = out[:limit]
+        return out, (encode_cursor(out[-1]) if more else None)
@@ -0,0 +1,113 @@
+# prebuilt.py — Body response yang di-serialize & dikompres sekali per snapshot
+#
+# /api/news dipanggil jauh lebih sering daripada snapshot berganti. Di sini
+# payload di-encode ke JSON, di-gzip & di-brotli, dan diberi ETag dari hash
+# isinya SEKALI; request berikutnya tinggal mengirim byte yang sama, atau
+# 304 kalau If-None-Match cocok.
+#
+# Paket brotli ada di requirements.txt; kalau tidak terpasang, body br
+# tidak dibuat dan klien menerima gzip saja.
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+from flask import Response, request
+
+import codec
+import metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Jumlah variasi query (filter/paging/fields) yang disimpan per snapshot
+MAX_ENTRIES = 256
+
+GZIP_LEVEL   = 6
+BROTLI_LEVEL = 5
+
+_M_LOOKUPS = metrics.Counter(
+    "packnews_body_cache_total", "Lookup body /api/news yang sudah jadi", ("result",),
+)
+
+
+class Prebuilt:
+    __slots__ = ("body", "gzip", "br", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.gzip = gzip.compress(body, GZIP_LEVEL)
+        self.br = brotli.compress(body, quality=BROTLI_LEVEL) if brotli else None
+
+
+def encode(payload) -> bytes:
+    return codec.dumps(payload)
+
+
+def build(payload) -> Prebuilt:
+    return Prebuilt(encode(payload))
+
+
+def respond(pre: Prebuilt, max_age=0, headers=None) -> Response:
+    """
+    Response dari body jadi: 304 kalau If-None-Match cocok, kalau tidak
+    pilih br / gzip / identity sesuai Accept-Encoding.
+    """
+    if request.if_none_match.contains_weak(pre.etag):
+        res = Response(status=304)
+    else:
+        offers = ["br", "gzip", "identity"] if pre.br else ["gzip", "identity"]
+        encoding = request.accept_encodings.best_match(offers, default="identity")
+        if encoding == "br":
+            res = Response(pre.br, mimetype="application/json")
+            res.headers["Content-Encoding"] = "br"
+        elif encoding == "gzip":
+            res = Response(pre.gzip, mimetype="application/json")
+            res.headers["Content-Encoding"] = "gzip"
+        else:
+            res = Response(pre.body, mimetype="application/json")
+    # ETag lemah: representasi br / gzip / identity berbagi ETag yang sama
+    res.set_etag(pre.etag, weak=True)
+    res.headers["Vary"] = "Accept-Encoding"
+    res.headers["Cache-Control"] = f"public, max-age={int(max_age)}"
+    for key, value in (headers or {}).items():
+        res.headers[key] = value
+    return res
+
+
+class BodyCache:
+    """
+    Prebuilt per (snapshot, key). Ganti snapshot → semua entri lama dibuang.
+    Snapshot dibandingkan dengan identitas objek (store mengembalikan objek
+    yang sama selama isinya tidak berubah).
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._snap = None
+        self._entries = OrderedDict()
+
+    def get(self, snap, key, make_payload) -> Prebuilt:
+        with self._lock:
+            if self._snap is not snap:
+                self._snap = snap
+                self._entries = OrderedDict()
+            entries = self._entries
+            pre = entries.get(key)
+            if pre is not None:
+                entries.move_to_end(key)
+                _M_LOOKUPS.labels("hit").inc()
+                return pre
+        _M_LOOKUPS.labels("miss").inc()
+        # Build di luar lock; kalau dua request bersamaan, hasilnya sama saja
+        pre = build(make_payload())
+        with self._lock:
+            if self._entries is entries:
+                entries[key] = pre
+                while len(entries) > self.max_entries:
+                    entries.popitem(last=False)
+        return pre
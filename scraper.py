@@ -1,22 +1,62 @@
 # scraper.py — Direct web-scraping version
 # Sumber: CNN Indonesia, Viva, Tribunnews, BBC Indonesia,
 #          Kompas, Kumparan, Liputan6, Cakaplah, Detik
-import requests
-from bs4 import BeautifulSoup
-import random
+#
+# Library berat (bs4, soupsieve, feedparser, requests, lxml) baru di-import
+# saat pertama kali dipakai, bukan saat modul ini di-import → worker web
+# bisa langsung melayani snapshot dari disk sementara scrape pertama jalan.
+import calendar
+import importlib.util
+import os
+import re
+import threading
 import time
 import html as html_mod
-
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/120.0.0.0 Safari/537.36"
-    ),
-    "Accept-Language": "id-ID,id;q=0.9,en-US;q=0.8,en;q=0.7",
-}
-
-TIMEOUT = 12  # detik
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+from article import Article
+from fetcher import fetch, fetch_stream
+from store import normalize_link
+import clusters
+import health
+import images
+import metrics
+
+# ─── Batas paralel ───
+# MAX_WORKERS   : jumlah sumber yang di-scrape bersamaan
+#                 (batas per host ada di fetcher.PER_HOST_LIMIT)
+# REFRESH_DEADLINE: batas waktu total satu kali refresh (detik);
+#                   sumber yang belum selesai ditinggal, hasil parsial dipakai
+MAX_WORKERS      = 6
+REFRESH_DEADLINE = 20
+
+# Validasi & pencarian gambar (og:image + HEAD) untuk artikel baru,
+# lihat images.py. Hasilnya di-cache per link.
+RESOLVE_IMAGES = True
+
+# Parser HTML: lxml (C, jauh lebih cepat) kalau terpasang, kalau tidak html.parser
+# (cukup dicek keberadaannya; di-import oleh bs4 / streamparse saat parse)
+_HAS_LXML = importlib.util.find_spec("lxml") is not None
+PARSER = "lxml" if _HAS_LXML else "html.parser"
+
+# Mode streaming (butuh lxml): halaman listing di-parse sambil di-download
+# dan pembacaan berhenti begitu `limit` card sudah terkumpul.
+# Sumber dengan selector yang tidak didukung streamparse otomatis memakai
+# BeautifulSoup biasa.
+if _HAS_LXML:
+    import streamparse
+else:
+    streamparse = None
+STREAM_PARSE = streamparse is not None
+
+# Proses parse terpisah: PARSE_WORKERS di environment (default 0 = parse
+# di thread scraper). Body halaman listing dikirim ke proses worker, yang
+# kembali hanya record ringkas (judul, link, gambar) → parse BeautifulSoup
+# memakai banyak core dan tidak berebut GIL dengan thread yang melayani
+# request. Selama satu halaman di-parse, thread scraper sudah mengambil
+# halaman berikutnya. Mode ini menggantikan STREAM_PARSE (butuh body utuh).
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", "0"))
 
 # ─────────────────────────────────────────────────────────
 # Placeholder per sumber (fallback kalau tidak ada gambar)
@@ -40,6 +80,106 @@ def _ph(source):
     return PLACEHOLDERS.get(source, DEFAULT_PH)
 
 
+_PH_URLS = frozenset(PLACEHOLDERS.values()) | {DEFAULT_PH}
+_images = images.ImageResolver()
+
+
+# ─── Metrik per sumber & per fase (dirender di /metrics, lihat metrics.py) ───
+# kind = feed | html. TTFB dari requests `elapsed` sudah termasuk DNS &
+# connect untuk koneksi baru (requests tidak memisahkannya).
+_M_PAGES = metrics.Counter(
+    "packnews_source_pages_total", "Halaman yang diambil per sumber",
+    ("source", "kind", "result"),
+)
+_M_TTFB = metrics.Histogram(
+    "packnews_source_ttfb_seconds", "Waktu sampai header response diterima",
+    ("source", "kind"),
+)
+_M_DOWNLOAD = metrics.Histogram(
+    "packnews_source_download_seconds", "Waktu menunggu body dari jaringan",
+    ("source", "kind"),
+)
+_M_BYTES = metrics.Counter(
+    "packnews_source_bytes_total", "Byte body yang dibaca (setelah dekompresi)",
+    ("source", "kind"),
+)
+_M_PARSE = metrics.Histogram(
+    "packnews_source_parse_seconds", "Waktu parse satu halaman (tanpa waktu jaringan)",
+    ("source", "kind"),
+)
+_M_CARDS = metrics.Counter(
+    "packnews_source_cards_total", "Card / item feed yang diperiksa",
+    ("source", "result"),
+)
+_M_SCRAPE = metrics.Histogram(
+    "packnews_source_scrape_seconds", "Durasi scrape satu sumber (semua halaman)",
+    ("source",),
+)
+M_PHASE = metrics.Histogram(
+    "packnews_refresh_phase_seconds", "Durasi tiap fase refresh", ("phase",),
+)
+
+
+def _observe_page(src, kind, page, parse_seconds=0.0):
+    name = src["name"]
+    _M_TTFB.labels(name, kind).observe(page.ttfb)
+    if page.not_modified:
+        _M_PAGES.labels(name, kind, "not_modified").inc()
+        return
+    _M_PAGES.labels(name, kind, "ok").inc()
+    _M_DOWNLOAD.labels(name, kind).observe(page.download)
+    _M_BYTES.labels(name, kind).inc(page.nbytes)
+    _M_PARSE.labels(name, kind).observe(parse_seconds)
+
+
+def _observe_cards(src, seen, matched):
+    _M_CARDS.labels(src["name"], "matched").inc(matched)
+    if seen > matched:
+        _M_CARDS.labels(src["name"], "rejected").inc(seen - matched)
+
+
+# ─── Cache hasil parse per halaman (untuk conditional GET) ───
+# url → (etag, last_modified, [artikel]); kalau server menjawab 304,
+# artikel lama dipakai lagi tanpa parsing ulang.
+_page_cache = {}
+_page_cache_lock = threading.Lock()
+
+
+def _validators(url: str) -> dict:
+    cached = _page_cache.get(url)
+    if cached:
+        return {"etag": cached[0], "last_modified": cached[1]}
+    return {}
+
+
+def _get(url: str, timeout=None):
+    """Fetch halaman; kirim validator dari hasil sebelumnya kalau ada."""
+    if timeout:
+        return fetch(url, timeout=timeout, **_validators(url))
+    return fetch(url, **_validators(url))
+
+
+def _get_stream(url: str, consume, timeout=None):
+    """Seperti _get(), tapi body langsung diteruskan ke consume(chunks, encoding)."""
+    if timeout:
+        return fetch_stream(url, consume, timeout=timeout, **_validators(url))
+    return fetch_stream(url, consume, **_validators(url))
+
+
+def _unchanged(url: str) -> list:
+    """Artikel dari fetch sebelumnya (dipakai kalau halaman 304)."""
+    cached = _page_cache.get(url)
+    return list(cached[2]) if cached else []
+
+
+def _remember(url: str, page, articles: list):
+    """Simpan hasil parse halaman bersama validator HTTP-nya."""
+    if not (page.etag or page.last_modified):
+        return
+    with _page_cache_lock:
+        _page_cache[url] = (page.etag, page.last_modified, list(articles))
+
+
 def _clean(text: str) -> str:
     """Bersihkan teks dari whitespace berlebih."""
     return " ".join(text.split()).strip()
@@ -59,462 +199,743 @@ def _abs_url(base: str, href: str) -> str:
 
 
 # ═══════════════════════════════════════════════════════════
-# SCRAPER PER SUMBER
+# REGISTRY SUMBER
 # ═══════════════════════════════════════════════════════════
+# Setiap sumber cukup dideskripsikan dengan data; tambah sumber baru =
+# tambah satu entri di SOURCES. Key yang tidak diisi memakai SOURCE_DEFAULTS.
+#
+#   name        : nama sumber (juga key PLACEHOLDERS)
+#   key         : dipakai untuk nama scraper → scrape_<key>
+#   base        : base URL untuk href/src relatif
+#   pages       : [(url, kategori), ...]
+#   cards       : selector CSS untuk card artikel
+#   fallback_cards : selector kalau `cards` tidak menemukan apa pun
+#   link / title   : selector CSS di dalam card
+#   limit       : jumlah card pertama yang diperiksa per halaman
+#   image_attrs : atribut <img> yang dicoba berurutan
+#   min_title / max_title : panjang judul yang diterima
+#   link_contains : link wajib mengandung string ini (None = bebas)
+#   feeds       : {kategori: url RSS/Atom}; dicoba dulu sebelum scrape HTML
+#   icon        : URL ikon sumber (default: <base>/favicon.ico)
+
+TITLE_SELECTOR = "h2, h3, h4, [class*='title'], [class*='headline']"
+
+SOURCE_DEFAULTS = {
+    "fallback_cards": None,
+    "link"          : "a[href]",
+    "title"         : TITLE_SELECTOR,
+    "limit"         : 6,
+    "image_attrs"   : ("src", "data-src"),
+    "min_title"     : 10,
+    "max_title"     : None,
+    "link_contains" : None,
+    "feeds"         : {},
+    "icon"          : None,
+}
 
-def scrape_cnn_indonesia():
-    """CNN Indonesia — nasional & internasional"""
-    articles = []
-    pages = [
-        ("https://www.cnnindonesia.com/nasional", "CNN Indonesia", "nasional"),
-        ("https://www.cnnindonesia.com/internasional", "CNN Indonesia", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            # CNN Indonesia menggunakan card dengan class tertentu
-            cards = soup.select("div.card-story, div[class*='card'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href*='/nasional/'], a[href*='/internasional/'], a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://www.cnnindonesia.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or img_tag.get("data-lazy-src") or ""
-                    image = _abs_url("https://www.cnnindonesia.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [CNN Indonesia] error ({cat}): {e}")
-    return articles
+SOURCES = [
+    {
+        "name" : "CNN Indonesia",
+        "key"  : "cnn_indonesia",
+        "base" : "https://www.cnnindonesia.com",
+        "pages": [
+            ("https://www.cnnindonesia.com/nasional", "nasional"),
+            ("https://www.cnnindonesia.com/internasional", "internasional"),
+        ],
+        "feeds": {
+            "nasional"     : "https://www.cnnindonesia.com/nasional/rss",
+            "internasional": "https://www.cnnindonesia.com/internasional/rss",
+        },
+        # CNN Indonesia menggunakan card dengan class tertentu
+        "cards"      : "div.card-story, div[class*='card'], article",
+        "link"       : "a[href*='/nasional/'], a[href*='/internasional/'], a[href]",
+        "image_attrs": ("src", "data-src", "data-lazy-src"),
+    },
+    {
+        "name" : "Viva",
+        "key"  : "viva",
+        "base" : "https://www.viva.co.id",
+        "pages": [
+            ("https://www.viva.co.id/baru/berita", "nasional"),
+            ("https://www.viva.co.id/baru/dunia", "internasional"),
+        ],
+        "cards": "div.article-list-item, div[class*='article'], div[class*='news'], article",
+    },
+    {
+        "name" : "Tribunnews",
+        "key"  : "tribunnews",
+        "base" : "https://www.tribunnews.com",
+        "pages": [
+            ("https://www.tribunnews.com/nasional", "nasional"),
+            ("https://www.tribunnews.com/dunia", "internasional"),
+        ],
+        "cards": "div.news-list-item, div[class*='news-list'], div[class*='article'], article",
+    },
+    {
+        "name" : "BBC Indonesia",
+        "key"  : "bbc_indonesia",
+        "base" : "https://www.bbc.com",
+        "pages": [
+            ("https://www.bbc.com/indonesia/indonesia", "nasional"),
+            ("https://www.bbc.com/indonesia/dunia", "internasional"),
+        ],
+        "feeds": {
+            "nasional"     : "https://www.bbc.com/indonesia/indonesia/index.xml",
+            "internasional": "https://www.bbc.com/indonesia/dunia/index.xml",
+        },
+        # BBC sering pakai data-testid atau structure <article>;
+        # fallback: cari semua <a> yang mengarah ke artikel
+        "cards"         : '[data-testid="card"], article[class*="card"], div[class*="card"]',
+        "fallback_cards": "a[href*='/indonesia/']",
+        "title"         : "h2, h3, h4, [data-testid*='headline'], [class*='title']",
+        "limit"         : 8,
+        "max_title"     : 200,
+        # Pastikan link mengarah ke artikel Indonesia
+        "link_contains" : "/indonesia/",
+    },
+    {
+        "name" : "Kompas",
+        "key"  : "kompas",
+        "base" : "https://www.kompas.com",
+        "pages": [
+            ("https://www.kompas.com/nasional", "nasional"),
+            ("https://www.kompas.com/global", "internasional"),
+        ],
+        "feeds": {
+            "nasional"     : "https://www.kompas.com/getrss/nasional",
+            "internasional": "https://www.kompas.com/getrss/global",
+        },
+        "cards": "div.story-card, div[class*='story'], div[class*='article'], article",
+    },
+    {
+        "name" : "Kumparan",
+        "key"  : "kumparan",
+        "base" : "https://kumparan.com",
+        "pages": [
+            ("https://kumparan.com/tag/nasional", "nasional"),
+            ("https://kumparan.com/tag/dunia", "internasional"),
+        ],
+        "cards": "div[class*='article'], div[class*='story'], article, div[class*='card']",
+    },
+    {
+        "name" : "Liputan6",
+        "key"  : "liputan6",
+        "base" : "https://www.liputan6.com",
+        "pages": [
+            ("https://www.liputan6.com/nasional", "nasional"),
+            ("https://www.liputan6.com/global", "internasional"),
+        ],
+        "feeds": {
+            "nasional"     : "https://feed.liputan6.com/rss/news",
+            "internasional": "https://feed.liputan6.com/rss/global",
+        },
+        "cards": "div.news-item, div[class*='article'], div[class*='story'], article",
+    },
+    {
+        "name" : "Cakaplah",
+        "key"  : "cakaplah",
+        "base" : "https://www.cakaplah.com",
+        "pages": [
+            ("https://www.cakaplah.com/berita/nasional", "nasional"),
+            ("https://www.cakaplah.com/berita/internasional", "internasional"),
+        ],
+        "cards": "div[class*='article'], div[class*='berita'], div[class*='news'], article",
+        "title": TITLE_SELECTOR + ", [class*='judul']",
+    },
+    {
+        "name" : "Detik",
+        "key"  : "detik",
+        "base" : "https://news.detik.com",
+        "pages": [
+            ("https://news.detik.com/nasional", "nasional"),
+            ("https://news.detik.com/dunia", "internasional"),
+        ],
+        "feeds": {
+            "nasional"     : "https://news.detik.com/berita/rss",
+            "internasional": "https://news.detik.com/internasional/rss",
+        },
+        "cards": "div.news-item, div[class*='news'], div[class*='article'], article",
+    },
+]
 
+for _src in SOURCES:
+    for _k, _v in SOURCE_DEFAULTS.items():
+        _src.setdefault(_k, _v)
+    _src["icon"] = _src["icon"] or _src["base"] + "/favicon.ico"
 
-def scrape_viva():
-    """Viva.co.id — nasional & internasional"""
-    articles = []
-    pages = [
-        ("https://www.viva.co.id/baru/berita", "Viva", "nasional"),
-        ("https://www.viva.co.id/baru/dunia", "Viva", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div.article-list-item, div[class*='article'], div[class*='news'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://www.viva.co.id", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://www.viva.co.id", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [Viva] error ({cat}): {e}")
-    return articles
+_ICONS = {src["name"]: src["icon"] for src in SOURCES}
 
 
-def scrape_tribunnews():
-    """Tribunnews.com — nasional & internasional"""
-    articles = []
-    pages = [
-        ("https://www.tribunnews.com/nasional", "Tribunnews", "nasional"),
-        ("https://www.tribunnews.com/dunia", "Tribunnews", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div.news-list-item, div[class*='news-list'], div[class*='article'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://www.tribunnews.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://www.tribunnews.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [Tribunnews] error ({cat}): {e}")
-    return articles
+def source_icon(name: str) -> str:
+    """URL ikon sumber (dipakai field `icon` di news.json), atau ""."""
+    return _ICONS.get(name, "")
 
 
-def scrape_bbc_indonesia():
-    """BBC Indonesia — nasional & internasional"""
+# ═══════════════════════════════════════════════════════════
+# ENGINE EKSTRAKSI
+# ═══════════════════════════════════════════════════════════
+
+@lru_cache(maxsize=None)
+def _sel(css: str):
+    """Selector CSS yang sudah di-compile (sekali per string selector)."""
+    import soupsieve
+    return soupsieve.compile(css)
+
+
+# Cara mengakses node untuk tiap backend parser:
+#   (nama tag, select_one(css, node), teks node)
+_SOUP_OPS = (
+    lambda node: node.name,
+    lambda css, node: _sel(css).select_one(node),
+    lambda node: node.get_text(),
+)
+_LXML_OPS = (
+    lambda node: node.tag,
+    lambda css, node: streamparse.select_one(css, node),
+    lambda node: streamparse.text(node),
+) if streamparse else None
+
+
+def _extract_card(src, cat, card, ops=_SOUP_OPS):
+    """Satu card → dict artikel, atau None kalau card tidak valid."""
+    name, select_one, get_text = ops
+    is_link = name(card) == "a"
+    a_tag = card if is_link else select_one(src["link"], card)
+    if a_tag is None:
+        return None
+
+    title_tag = select_one(src["title"], card)
+    if title_tag is not None:
+        title = _clean(get_text(title_tag))
+    elif is_link:
+        # Card sendiri adalah <a> → ambil teks langsung
+        title = _clean(get_text(card))
+    else:
+        return None
+
+    if len(title) < src["min_title"]:
+        return None
+    if src["max_title"] and len(title) > src["max_title"]:
+        return None
+
+    link = _abs_url(src["base"], a_tag.get("href", ""))
+    if src["link_contains"] and src["link_contains"] not in link:
+        return None
+
+    image = ""
+    img_tag = select_one("img", card)
+    if img_tag is not None:
+        # Lewati placeholder lazy-load, coba data-src / srcset dsb.
+        image = images.from_img(img_tag, src["image_attrs"], src["base"], _abs_url)
+
+    return Article(src["name"], title[:150], link, image or _ph(src["name"]), cat)
+
+
+def _listing(src, cat, body: bytes):
+    """Body halaman listing → (daftar artikel, jumlah card yang diperiksa)."""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(body, PARSER)
+    cards = _sel(src["cards"]).select(soup, limit=src["limit"])
+    if not cards and src["fallback_cards"]:
+        cards = _sel(src["fallback_cards"]).select(soup, limit=src["limit"])
     articles = []
-    pages = [
-        ("https://www.bbc.com/indonesia/indonesia", "BBC Indonesia", "nasional"),
-        ("https://www.bbc.com/indonesia/dunia", "BBC Indonesia", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            # BBC sering pakai data-testid atau structure <article>
-            cards = soup.select('[data-testid="card"], article[class*="card"], div[class*="card"]')
-            if not cards:
-                # fallback: cari semua <a> yang mengarah ke artikel
-                cards = soup.select("a[href*='/indonesia/']")
-            for card in cards[:8]:
-                a_tag = card if card.name == "a" else card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [data-testid*='headline'], [class*='title']")
-
-                if not a_tag:
-                    continue
-
-                # Kalau card sendiri adalah <a>, ambil teks langsung
-                if not title_tag and card.name == "a":
-                    title = _clean(card.get_text())
-                else:
-                    if not title_tag:
-                        continue
-                    title = _clean(title_tag.get_text())
-
-                if len(title) < 10 or len(title) > 200:
-                    continue
-
-                link = _abs_url("https://www.bbc.com", a_tag.get("href", ""))
-                # Pastikan link mengarah ke artikel Indonesia
-                if "/indonesia/" not in link:
-                    continue
-
-                img_tag = card.select_one("img")
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://www.bbc.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [BBC Indonesia] error ({cat}): {e}")
-    return articles
+    for card in cards:
+        art = _extract_card(src, cat, card)
+        if art:
+            articles.append(art)
+    return articles, len(cards)
 
 
-def scrape_kompas():
-    """Kompas.com — nasional & internasional"""
-    articles = []
-    pages = [
-        ("https://www.kompas.com/nasional", "Kompas", "nasional"),
-        ("https://www.kompas.com/global", "Kompas", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div.story-card, div[class*='story'], div[class*='article'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://www.kompas.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://www.kompas.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [Kompas] error ({cat}): {e}")
+def _parse_listing(src, cat, body: bytes) -> list:
+    """Parse satu halaman listing (body lengkap) → daftar artikel."""
+    articles, seen = _listing(src, cat, body)
+    _observe_cards(src, seen, len(articles))
     return articles
 
 
-def scrape_kumparan():
-    """Kumparan.com — nasional & internasional"""
+def _stream_listing(src, cat, chunks, encoding=None) -> list:
+    """Parse halaman listing sambil dibaca; berhenti setelah `limit` card."""
     articles = []
-    pages = [
-        ("https://kumparan.com/tag/nasional", "Kumparan", "nasional"),
-        ("https://kumparan.com/tag/dunia", "Kumparan", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div[class*='article'], div[class*='story'], article, div[class*='card']")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://kumparan.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://kumparan.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [Kumparan] error ({cat}): {e}")
+    seen = 0
+    cards = streamparse.iter_cards(
+        chunks, src["cards"], src["limit"],
+        fallback_css=src["fallback_cards"], encoding=encoding,
+    )
+    for card in cards:
+        seen += 1
+        art = _extract_card(src, cat, card, _LXML_OPS)
+        if art:
+            articles.append(art)
+    _observe_cards(src, seen, len(articles))
     return articles
 
 
-def scrape_liputan6():
-    """Liputan6.com — nasional & internasional"""
-    articles = []
-    pages = [
-        ("https://www.liputan6.com/nasional", "Liputan6", "nasional"),
-        ("https://www.liputan6.com/global", "Liputan6", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div.news-item, div[class*='article'], div[class*='story'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://www.liputan6.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://www.liputan6.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [Liputan6] error ({cat}): {e}")
-    return articles
+# ─── Pool proses parse (PARSE_WORKERS) ───
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
 
 
-def scrape_cakaplah():
-    """Cakaplah.com — nasional & internasional"""
-    articles = []
-    pages = [
-        ("https://www.cakaplah.com/berita/nasional", "Cakaplah", "nasional"),
-        ("https://www.cakaplah.com/berita/internasional", "Cakaplah", "internasional"),
-    ]
-    for url, source, cat in pages:
-        try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div[class*='article'], div[class*='berita'], div[class*='news'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline'], [class*='judul']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://www.cakaplah.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://www.cakaplah.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
-        except Exception as e:
-            print(f"  [Cakaplah] error ({cat}): {e}")
-    return articles
+def _parse_remote(key, cat, body: bytes):
+    """
+    Dijalankan di proses parse worker: body → ([(judul, link, gambar)],
+    jumlah card, detik parse). Record sengaja ringkas supaya murah dikirim.
+    """
+    t0 = time.perf_counter()
+    src = next(s for s in SOURCES if s["key"] == key)
+    articles, seen = _listing(src, cat, body)
+    records = [(a["title"], a["link"], a["image"]) for a in articles]
+    return records, seen, time.perf_counter() - t0
+
+
+def _get_parse_pool():
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn, bukan fork: proses ini punya banyak thread (refresher,
+            # scraper, image) yang tidak aman di-fork
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _parse_pool
+
+
+def _reset_parse_pool(broken):
+    """Buang pool yang rusak (sekali saja); pool pengganti milik thread lain dibiarkan."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is not broken:
+            return
+        _parse_pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_parse(src, cat, body: bytes):
+    """Kirim body ke proses parse → (pool tujuan, Future)."""
+    from concurrent.futures.process import BrokenProcessPool
+    pool = _get_parse_pool()
+    try:
+        return pool, pool.submit(_parse_remote, src["key"], cat, body)
+    except BrokenProcessPool:
+        _reset_parse_pool(pool)
+        fut = Future()
+        fut.set_result(_parse_remote(src["key"], cat, body))
+        return pool, fut
+
+
+def _parse_result(src, cat, body: bytes, pool, fut: Future) -> list:
+    """Tunggu hasil proses parse → (daftar artikel, detik parse); parse lokal kalau pool rusak."""
+    from concurrent.futures.process import BrokenProcessPool
+    try:
+        records, seen, seconds = fut.result()
+    except BrokenProcessPool:
+        print(f"  [{src['name']}] proses parse mati, parse di thread ini")
+        _reset_parse_pool(pool)
+        records, seen, seconds = _parse_remote(src["key"], cat, body)
+    articles = [Article(src["name"], title, link, image, cat) for title, link, image in records]
+    _observe_cards(src, seen, len(articles))
+    return articles, seconds
+
+
+@lru_cache(maxsize=None)
+def _streamable(name: str) -> bool:
+    """Apakah semua selector sumber ini bisa dipakai oleh streamparse."""
+    src = next(s for s in SOURCES if s["name"] == name)
+    try:
+        for css in (src["cards"], src["fallback_cards"], src["link"], src["title"]):
+            if css:
+                streamparse.compile_selector(css)
+    except ValueError as e:
+        print(f"  [{name}] mode streaming nonaktif: {e}")
+        return False
+    return True
+
+
+# ═══════════════════════════════════════════════════════════
+# FEED RSS/ATOM (jalur cepat)
+# ═══════════════════════════════════════════════════════════
+# Feed jauh lebih kecil dari halaman HTML. Kalau feed gagal, kosong, atau
+# item terbarunya lebih tua dari FEED_MAX_AGE, scraper HTML dipakai.
+
+FEED_MAX_AGE = 6 * 3600  # detik
+
+_IMG_SRC_RE = re.compile(r"""<img[^>]+src=["']([^"']+)""", re.I)
+
+# Item terbaru per URL feed (epoch) — dipakai saat feed menjawab 304
+_feed_newest = {}
+
+# ─── Statistik jalur per sumber ───
+# name → {"feed": n, "html": n, "feed_failed": n, "feed_stale": n,
+#         "last": {kategori: "feed" | "html"}}
+_source_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _count(src, cat, key, path=None):
+    with _stats_lock:
+        st = _source_stats.setdefault(
+            src["name"],
+            {"feed": 0, "html": 0, "feed_failed": 0, "feed_stale": 0, "last": {}},
+        )
+        st[key] += 1
+        if path:
+            st["last"][cat] = path
+
+
+def source_stats() -> dict:
+    """Salinan statistik jalur (feed / html) per sumber."""
+    with _stats_lock:
+        return {name: dict(st, last=dict(st["last"])) for name, st in _source_stats.items()}
 
 
-def scrape_detik():
-    """Detik.com — nasional & internasional"""
+def _entry_time(entry):
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    return calendar.timegm(parsed) if parsed else None
+
+
+def _entry_image(entry) -> str:
+    for key in ("media_content", "media_thumbnail"):
+        for media in entry.get(key) or []:
+            if media.get("url"):
+                return media["url"]
+    for enc in entry.get("enclosures") or []:
+        if enc.get("type", "").startswith("image/") and enc.get("href"):
+            return enc["href"]
+    m = _IMG_SRC_RE.search(entry.get("summary", ""))
+    return html_mod.unescape(m.group(1)) if m else ""
+
+
+def _parse_feed(src, cat, body: bytes):
+    """Body feed → (daftar artikel, waktu item terbaru atau None)."""
+    import feedparser
+    parsed = feedparser.parse(body)
     articles = []
-    pages = [
-        ("https://news.detik.com/nasional", "Detik", "nasional"),
-        ("https://news.detik.com/dunia", "Detik", "internasional"),
-    ]
-    for url, source, cat in pages:
+    newest = None
+    entries = parsed.entries[:src["limit"]]
+    for entry in entries:
+        ts = _entry_time(entry)
+        if ts and (newest is None or ts > newest):
+            newest = ts
+        title = _clean(entry.get("title", ""))
+        link = _abs_url(src["base"], entry.get("link", ""))
+        if len(title) < src["min_title"] or not link:
+            continue
+        if src["max_title"] and len(title) > src["max_title"]:
+            continue
+        if src["link_contains"] and src["link_contains"] not in link:
+            continue
+        image = _abs_url(src["base"], _entry_image(entry))
+        articles.append(Article(src["name"], title[:150], link, image or _ph(src["name"]), cat))
+    _observe_cards(src, len(entries), len(articles))
+    return articles, newest
+
+
+def _from_feed(src, cat, feed_url, timeout=None):
+    """Artikel dari feed, atau None kalau harus fallback ke HTML."""
+    try:
+        page = _get(feed_url, timeout)
+        if page.not_modified:
+            found = _unchanged(feed_url)
+            newest = _feed_newest.get(feed_url)
+            _observe_page(src, "feed", page)
+        else:
+            t0 = time.perf_counter()
+            found, newest = _parse_feed(src, cat, page.body)
+            _observe_page(src, "feed", page, time.perf_counter() - t0)
+            if newest:
+                _feed_newest[feed_url] = newest
+    except Exception as e:
+        print(f"  [{src['name']}] feed gagal ({cat}): {e}")
+        _M_PAGES.labels(src["name"], "feed", "error").inc()
+        _count(src, cat, "feed_failed")
+        return None
+    if not found:
+        _count(src, cat, "feed_failed")
+        return None
+    if newest and time.time() - newest > FEED_MAX_AGE:
+        _count(src, cat, "feed_stale")
+        return None
+    if not page.not_modified:
+        _remember(feed_url, page, found)
+    return found
+
+
+def _from_html(src, cat, url, stream, timeout=None):
+    """
+    Artikel dari halaman listing HTML. Dengan PARSE_WORKERS, parse dikirim
+    ke proses worker dan yang dikembalikan adalah fungsi tanpa argumen
+    yang menunggu hasilnya (fetch halaman berikutnya bisa jalan dulu).
+    """
+    if PARSE_WORKERS and not stream:
+        page = _get(url, timeout)
+        if page.not_modified:
+            _observe_page(src, "html", page)
+            return _unchanged(url)
+        pool, fut = _submit_parse(src, cat, page.body)
+
+        def finish():
+            found, parse_seconds = _parse_result(src, cat, page.body, pool, fut)
+            _observe_page(src, "html", page, parse_seconds)
+            _remember(url, page, found)
+            return found
+        return finish
+
+    if stream:
+        # Parse berjalan bersamaan dengan download → waktu tunggu
+        # jaringan (page.download) dikurangkan dari durasi consume
+        spent = [0.0]
+
+        def consume(chunks, enc):
+            t0 = time.perf_counter()
+            try:
+                return _stream_listing(src, cat, chunks, enc)
+            finally:
+                spent[0] = time.perf_counter() - t0
+
+        page, found = _get_stream(url, consume, timeout)
+        parse_seconds = max(0.0, spent[0] - page.download)
+    else:
+        page = _get(url, timeout)
+        t0 = time.perf_counter()
+        found = None if page.not_modified else _parse_listing(src, cat, page.body)
+        parse_seconds = time.perf_counter() - t0
+    _observe_page(src, "html", page, parse_seconds)
+    if page.not_modified:
+        return _unchanged(url)
+    _remember(url, page, found)
+    return found
+
+
+def scrape_source(src, run=None) -> list:
+    """
+    Scrape semua halaman satu sumber dari registry (feed dulu, lalu HTML).
+
+    Latensi dan kegagalan setiap halaman dicatat di health.get(nama) lewat
+    `run` (health.Run); timeout request diambil dari latensi yang pernah
+    teramati. Setelah run.expire() (lewat deadline) sisa halaman tidak
+    diambil lagi.
+    """
+    stream = STREAM_PARSE and not PARSE_WORKERS and _streamable(src["name"])
+    h = health.get(src["name"])
+    if run is None:
+        run = health.Run(h)
+    timeout = h.timeout()
+    parts = []   # per halaman: daftar artikel, atau fungsi penunggu hasil parse
+    for url, cat in src["pages"]:
+        if run.expired:
+            break
+        feed_url = src["feeds"].get(cat)
+        if feed_url:
+            t0 = time.monotonic()
+            found = _from_feed(src, cat, feed_url, timeout)
+            if found:
+                run.success(time.monotonic() - t0)
+                _count(src, cat, "feed", "feed")
+                parts.append((cat, found))
+                continue
+        t0 = time.monotonic()
         try:
-            res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(res.text, "html.parser")
-            cards = soup.select("div.news-item, div[class*='news'], div[class*='article'], article")
-            for card in cards[:6]:
-                a_tag = card.select_one("a[href]")
-                title_tag = card.select_one("h2, h3, h4, [class*='title'], [class*='headline']")
-                img_tag = card.select_one("img")
-
-                if not a_tag or not title_tag:
-                    continue
-
-                title = _clean(title_tag.get_text())
-                if len(title) < 10:
-                    continue
-
-                link = _abs_url("https://news.detik.com", a_tag.get("href", ""))
-                image = ""
-                if img_tag:
-                    image = img_tag.get("src") or img_tag.get("data-src") or ""
-                    image = _abs_url("https://news.detik.com", image)
-
-                articles.append({
-                    "source": source,
-                    "title": title[:150],
-                    "link": link,
-                    "image": image or _ph(source),
-                    "category": cat,
-                })
+            found = _from_html(src, cat, url, stream, timeout)
         except Exception as e:
-            print(f"  [Detik] error ({cat}): {e}")
+            print(f"  [{src['name']}] error ({cat}): {e}")
+            _M_PAGES.labels(src["name"], "html", "error").inc()
+            run.failure(e)
+            continue
+        run.success(time.monotonic() - t0)
+        _count(src, cat, "html", "html")
+        parts.append((cat, found))
+
+    articles = []
+    for cat, found in parts:
+        if callable(found):
+            try:
+                found = found()
+            except Exception as e:
+                print(f"  [{src['name']}] parse error ({cat}): {e}")
+                _M_PAGES.labels(src["name"], "html", "error").inc()
+                run.failure(e)
+                continue
+        articles.extend(found)
     return articles
 
 
+def _make_scraper(src):
+    def scraper_fn(run=None):
+        return scrape_source(src, run)
+    scraper_fn.__name__ = scraper_fn.__qualname__ = "scrape_" + src["key"]
+    scraper_fn.source = src["name"]
+    scraper_fn.__doc__ = f"{src['name']} — " + " & ".join(cat for _, cat in src["pages"])
+    return scraper_fn
+
+
 # ═══════════════════════════════════════════════════════════
 # MASTER SCRAPER
 # ═══════════════════════════════════════════════════════════
 
-ALL_SCRAPERS = [
-    scrape_cnn_indonesia,
-    scrape_viva,
-    scrape_tribunnews,
-    scrape_bbc_indonesia,
-    scrape_kompas,
-    scrape_kumparan,
-    scrape_liputan6,
-    scrape_cakaplah,
-    scrape_detik,
-]
+ALL_SCRAPERS = [_make_scraper(src) for src in SOURCES]
+
+
+def _source_name(scraper_fn):
+    return getattr(scraper_fn, "source", scraper_fn.__name__)
 
 
-def get_all_news(limit_per_source=3):
+def _run_scraper(scraper_fn, run):
+    print(f"  Jalankan {scraper_fn.__name__}...")
+    with _M_SCRAPE.labels(_source_name(scraper_fn)).time():
+        result = scraper_fn(run)
+    print(f"    → {scraper_fn.__name__}: {len(result)} artikel")
+    return result
+
+
+def collect_news(deadline=None, wait_images=False) -> list:
     """
-    Jalankan semua scraper, gabungkan, hapus duplikat,
-    acak urutan agar setiap refresh menampilkan berita berbeda.
+    Jalankan semua scraper secara paralel, gabungkan, hapus duplikat.
+    Mengembalikan SEMUA artikel unik (belum diacak / dipotong).
+
+    Scraper yang belum selesai saat `deadline` (default REFRESH_DEADLINE)
+    habis diabaikan → yang dikembalikan hasil parsial dari sumber yang cepat.
+    wait_images=True menunggu semua gambar selesai di-resolve, bukan hanya
+    images.RESOLVE_DEADLINE (mode batch, lihat export.py).
     """
     print("Memulai pengambilan berita dari semua sumber...")
+    if deadline is None:
+        deadline = REFRESH_DEADLINE
     all_articles = []
 
+    # Sumber yang circuit-nya sedang open tidak dijalankan sama sekali
+    scrapers = []
     for scraper_fn in ALL_SCRAPERS:
+        if health.get(_source_name(scraper_fn)).allow():
+            scrapers.append(scraper_fn)
+        else:
+            print(f"    ⏸ {scraper_fn.__name__}: circuit open, dilewati")
+
+    runs = [health.Run(health.get(_source_name(fn))) for fn in scrapers]
+    pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="scraper")
+    futures = [pool.submit(_run_scraper, fn, run) for fn, run in zip(scrapers, runs)]
+    try:
+        with M_PHASE.labels("scrape").time():
+            wait(futures, timeout=deadline)
+    finally:
+        # Jangan tunggu scraper yang lambat; yang belum mulai dibatalkan
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # Urutan hasil mengikuti ALL_SCRAPERS, bukan urutan selesai
+    for scraper_fn, run, fut in zip(scrapers, runs, futures):
+        if not fut.done():
+            print(f"    ✗ {scraper_fn.__name__}: lewat deadline {deadline}s, dilewati")
+            # Halaman yang selesai belakangan tidak lagi dicatat sukses
+            run.expire(f"lewat deadline {deadline}s")
+            continue
+        if fut.cancelled():
+            continue
         try:
-            print(f"  Jalankan {scraper_fn.__name__}...")
-            result = scraper_fn()
-            all_articles.extend(result)
-            print(f"    → {len(result)} artikel")
+            all_articles.extend(fut.result())
         except Exception as e:
-            print(f"    ✗ Error: {e}")
-        time.sleep(0.5)  # jeda kecil antar sumber
+            print(f"    ✗ {scraper_fn.__name__} error: {e}")
 
     print(f"\nTotal sebelum dedup: {len(all_articles)}")
+    with M_PHASE.labels("dedup").time():
+        unique = dedup(all_articles)
+    print(f"Total setelah dedup: {len(unique)}")
+    if RESOLVE_IMAGES:
+        with M_PHASE.labels("images").time():
+            unique = _images.resolve(
+                unique, _ph, placeholders=_PH_URLS,
+                deadline=None if wait_images else images.RESOLVE_DEADLINE,
+            )
+    return unique
 
-    # ── Hapus duplikat berdasarkan judul (case-insensitive, 60 char pertama)
+
+def shutdown():
+    """Hentikan pool latar (gambar, parse) — dipanggil proses batch sebelum keluar."""
+    _images.shutdown()
+    pool = _parse_pool
+    if pool is not None:
+        _reset_parse_pool(pool)
+
+
+def dedup(articles) -> list:
+    """Hapus duplikat berdasarkan link (dinormalisasi) dan judul (60 char pertama)."""
     unique = []
     seen_titles = set()
     seen_links  = set()
-    for art in all_articles:
+    for art in articles:
+        if not art["title"] or not art["link"]:
+            continue
         title_key = art["title"][:60].lower().strip()
-        link_key  = art["link"].strip().lower()
+        link_key  = normalize_link(art["link"])
         if title_key in seen_titles or link_key in seen_links:
             continue
-        if not art["title"] or not art["link"]:
-            continue
         seen_titles.add(title_key)
         seen_links.add(link_key)
         unique.append(art)
+    return unique
 
-    print(f"Total setelah dedup: {len(unique)}")
 
-    # ── Acak urutan → setiap refresh tampil berbeda
-    random.shuffle(unique)
+# Index cerita lintas refresh (near-duplicate antar sumber, lihat clusters.py)
+_stories = clusters.StoryIndex()
+
+
+def group_stories(articles) -> list:
+    """Satu artikel per cerita; sisanya masuk field `related` milik wakilnya."""
+    return _stories.group(articles)
+
+
+# ─── Urutan & rotasi tampilan default ───
+# Pool diurutkan SEKALI per snapshot (rank_articles), lalu yang ditampilkan
+# adalah jendela `limit` artikel yang bergeser setiap ROTATION_SLOT detik
+# (atau per seed klien). Pool + slot yang sama → pilihan yang sama, jadi
+# response bisa di-cache (ETag / CDN) dan di-diff.
+ROTATION_SLOT = 60  # detik
+
 
-    # ── Batasi jumlah total yang dikembalikan
-    return unique[:18]
+def rank_articles(articles) -> list:
+    """
+    Urutan tetap: artikel setiap sumber terbaru dulu (first_seen, kalau
+    tidak ada → urutan input), lalu sumber bergiliran (round-robin) mulai
+    dari sumber dengan artikel terbaru → satu sumber tidak mendominasi.
+    """
+    queues = {}
+    for art in sorted(articles, key=lambda a: -(a.get("first_seen") or 0)):
+        queues.setdefault(art["source"], []).append(art)
+    ranked = []
+    depth = 0
+    while len(ranked) < len(articles):
+        for items in queues.values():
+            if depth < len(items):
+                ranked.append(items[depth])
+        depth += 1
+    return ranked
+
+
+def rotation_slot(ts: float) -> int:
+    return int(ts // ROTATION_SLOT)
+
+
+def window_count(total: int, limit: int) -> int:
+    """Jumlah jendela berbeda untuk pool berisi `total` artikel."""
+    return max(1, -(-total // limit))
+
+
+def pick_articles(ranked, limit=18, slot=0) -> list:
+    """Jendela ke-`slot` (berputar) dari urutan rank_articles, maks. `limit` artikel."""
+    if len(ranked) <= limit:
+        return list(ranked)
+    start = (slot % window_count(len(ranked), limit)) * limit
+    window = ranked[start:start + limit]
+    # Jendela terakhir yang tidak penuh disambung dengan awal urutan
+    return window + ranked[:limit - len(window)]
+
+
+def get_all_news(limit_per_source=3, deadline=None):
+    """
+    Jalankan semua scraper, gabungkan, hapus duplikat, urutkan
+    (rank_articles), lalu ambil jendela rotasi untuk slot waktu sekarang.
+    """
+    ranked = rank_articles(group_stories(collect_news(deadline)))
+    return pick_articles(ranked, slot=rotation_slot(time.time()))
 
 
 # ═══════════════════════════════════════════════════════════
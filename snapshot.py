@@ -0,0 +1,197 @@
+# snapshot.py — Penyimpanan snapshot berita yang bisa dibagi antar worker
+#
+# Dengan gunicorn (N worker), cache in-memory membuat setiap worker
+# men-scrape sendiri-sendiri. Di sini snapshot ditulis oleh SATU worker
+# (leader, dipilih lewat file lock) dan dibaca oleh semua worker lain.
+# Lock leader dipegang sampai prosesnya berhenti: leader tetap, jadi state
+# per proses (cache halaman, circuit breaker, cache gambar, backoff retry)
+# tidak terpecah ke beberapa worker. Worker lain baru mengambil alih kalau
+# leader mati (OS melepas flock-nya).
+#
+# Selain snapshot, leader menerbitkan state refresher-nya (running / error,
+# error terakhir, jadwal berikutnya) lewat write_state(); worker lain
+# membacanya dengan read_state() supaya header & /api/status mereka sama.
+#
+# Backend:
+#   FileSnapshotStore   → file JSON di disk lokal (default, lintas proses)
+#   MemorySnapshotStore → dict di memori (perilaku lama, per proses)
+#
+# Pilih lewat environment:
+#   SNAPSHOT_BACKEND = file | memory
+#   SNAPSHOT_PATH    = lokasi file snapshot (default: <tmp>/packnews-snapshot.json);
+#                      state refresher di <SNAPSHOT_PATH>.state
+#
+# Artikel snapshot yang dibaca dari file dijadikan article.Article; item
+# `articles` memakai objek yang sama dengan item `pool` (tidak disalin).
+import os
+import tempfile
+import threading
+
+import codec
+from article import Article
+
+try:
+    import fcntl
+except ImportError:  # Windows → tidak ada flock, setiap proses jadi leader
+    fcntl = None
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "packnews-snapshot.json")
+
+
+def _compact(snapshot):
+    """Artikel (dict hasil JSON) → Article; `articles` berbagi objek dengan `pool`."""
+    if not isinstance(snapshot, dict):
+        return snapshot
+    pool = [Article.from_dict(a) for a in snapshot.get("pool") or ()]
+    by_link = {art.link: art for art in pool}
+    if "pool" in snapshot:
+        snapshot["pool"] = pool
+    if "articles" in snapshot:
+        snapshot["articles"] = [
+            by_link.get(a["link"]) or Article.from_dict(a) for a in snapshot["articles"]
+        ]
+    return snapshot
+
+
+def _write_atomic(path, body: bytes):
+    """Tulis ke file sementara lalu os.replace → pembaca tidak pernah melihat file setengah jadi."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class MemorySnapshotStore:
+    """Snapshot di memori proses ini saja."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._state = None
+
+    def read(self):
+        return self._snapshot
+
+    def write(self, snapshot):
+        self._snapshot = snapshot
+
+    def read_state(self):
+        return self._state
+
+    def write_state(self, state):
+        self._state = dict(state)
+
+    def claim(self):
+        """Satu proses saja → proses ini selalu leader."""
+        return True
+
+
+class FileSnapshotStore:
+    """
+    Snapshot di file lokal, aman dibaca banyak proses sekaligus.
+
+    - write(): tulis ke file sementara lalu os.replace → pembaca tidak
+      pernah melihat file setengah jadi.
+    - read(): cukup stat() file; JSON hanya di-parse ulang kalau file
+      berubah, kalau tidak objek yang sama dikembalikan tanpa disalin.
+    - claim(): flock non-blocking pada file .lock; pemegang lock = leader,
+      dan lock tidak dilepas selama proses hidup.
+    - write_state() / read_state(): state refresher leader di file .state,
+      ditulis & dibaca dengan cara yang sama.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.lock_path = path + ".lock"
+        self.state_path = path + ".state"
+        self._key = None
+        self._snapshot = None
+        self._state = (None, None)   # (key stat, state), ditukar sekaligus
+        self._read_lock = threading.Lock()
+        self._lead_fd = None
+        self._lead_lock = threading.Lock()
+
+    def read(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._key:
+            return self._snapshot
+        with self._read_lock:
+            if key != self._key:
+                try:
+                    with open(self.path, "rb") as f:
+                        snapshot = _compact(codec.loads(f.read()))
+                except (OSError, ValueError):
+                    # File baru saja diganti / rusak → pakai yang lama dulu
+                    return self._snapshot
+                self._snapshot = snapshot
+                self._key = key
+        return self._snapshot
+
+    def write(self, snapshot):
+        _write_atomic(self.path, codec.dumps(snapshot))
+
+    def read_state(self):
+        try:
+            st = os.stat(self.state_path)
+        except FileNotFoundError:
+            return None
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        cached_key, state = self._state
+        if key == cached_key:
+            return state
+        try:
+            with open(self.state_path, "rb") as f:
+                state = codec.loads(f.read())
+        except (OSError, ValueError):
+            return state
+        self._state = (key, state)
+        return state
+
+    def write_state(self, state):
+        _write_atomic(self.state_path, codec.dumps(state))
+
+    def claim(self):
+        """
+        True kalau proses ini leader. Sekali berhasil, lock dipegang terus
+        (fd tidak ditutup); yang gagal cukup memanggil ulang nanti — berhasil
+        begitu proses leader berhenti.
+        """
+        if fcntl is None:
+            return True
+        with self._lead_lock:
+            if self._lead_fd is not None:
+                return True
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+            self._lead_fd = fd
+            return True
+
+
+BACKENDS = {
+    "file"  : lambda: FileSnapshotStore(os.environ.get("SNAPSHOT_PATH", DEFAULT_PATH)),
+    "memory": MemorySnapshotStore,
+}
+
+
+def from_env():
+    """Buat store sesuai SNAPSHOT_BACKEND (default: file)."""
+    name = os.environ.get("SNAPSHOT_BACKEND", "file").lower()
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"SNAPSHOT_BACKEND tidak dikenal: {name!r} (pilih: {', '.join(BACKENDS)})")
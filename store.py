@@ -0,0 +1,299 @@
+# store.py — Penyimpanan artikel permanen (SQLite di disk lokal)
+#
+# Setiap refresh hanya meng-upsert artikel yang baru / berubah, dengan
+# kunci link yang sudah dinormalisasi, dan mencatat first_seen & last_seen.
+# Snapshot yang disajikan API dibangun dari sini, jadi restart tidak
+# kehilangan data dan worker bisa langsung menyajikan berita saat start.
+#
+# Pencarian: tabel FTS5 `search` berisi judul dan isi artikel dalam bentuk
+# kandidat kata dasar (textutil.terms), jadi query "pemberitaan" bertemu
+# "berita". Kalau aturan stemming berubah, naikkan SEARCH_VERSION → index
+# dibangun ulang saat store dibuka. rowid-nya = rowid artikel (store tidak pernah
+# di-VACUUM, jadi rowid tetap). Diperbarui bertahap: judul saat upsert,
+# isi saat set_body (lihat fulltext.py). Isi mentah disimpan di tabel
+# `bodies` — sekaligus cache per link supaya halaman artikel tidak diambil
+# dua kali. SQLite tanpa FTS5 → `searchable` False, sisanya tetap jalan.
+#
+# Lokasi file: environment ARTICLE_DB (default: <tmp>/packnews-articles.db)
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from article import Article
+from textutil import stems, terms, tokenize
+
+DEFAULT_PATH = os.path.join(tempfile.gettempdir(), "packnews-articles.db")
+
+# Artikel yang tidak terlihat lagi selama ini dihapus dari store
+RETENTION = 7 * 24 * 3600  # detik
+
+# Kolom konten; perubahan di salah satunya = artikel "berubah"
+FIELDS = ("source", "title", "link", "image", "category")
+
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "_ga")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    link_key   TEXT PRIMARY KEY,
+    source     TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    link       TEXT NOT NULL,
+    image      TEXT NOT NULL,
+    category   TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_last_seen ON articles (last_seen);
+CREATE TABLE IF NOT EXISTS bodies (
+    link_key   TEXT PRIMARY KEY,
+    text       TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search USING fts5(title, body, tokenize = 'unicode61');
+"""
+
+# Bobot BM25 per kolom (title, body): judul yang cocok lebih relevan
+SEARCH_WEIGHTS = (3.0, 1.0)
+# Versi isi index (PRAGMA user_version); 2 = semua kandidat stem
+SEARCH_VERSION = 2
+
+
+def _search_text(text) -> str:
+    return " ".join(terms(text or ""))
+
+
+def _match_query(query: str):
+    """
+    Teks query → ekspresi MATCH FTS5, atau None. Setiap kata wajib ada,
+    cukup salah satu kandidat kata dasarnya: ("temba" OR "tembak") AND ...
+    """
+    groups = dict.fromkeys(stems(tok) for tok in tokenize(query))
+    return " AND ".join(
+        "(" + " OR ".join(f'"{s}"' for s in group) + ")" for group in groups
+    ) or None
+
+
+def normalize_link(url: str) -> str:
+    """
+    Kunci link untuk dedup: scheme & host huruf kecil, tanpa fragment,
+    tanpa parameter tracking (utm_*, fbclid, ...), tanpa "/" di akhir.
+    """
+    parts = urlsplit(url.strip())
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    ]
+    return urlunsplit((
+        parts.scheme.lower() or "https",
+        parts.netloc.lower(),
+        parts.path.rstrip("/") or "/",
+        urlencode(query),
+        "",
+    ))
+
+
+class ArticleStore:
+    """Tabel artikel SQLite. Satu koneksi, dijaga lock (dipakai refresher)."""
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._db.row_factory = sqlite3.Row
+        # Dipakai SQL untuk mengisi tabel search langsung dari kolom artikel
+        self._db.create_function("search_text", 1, _search_text, deterministic=True)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        try:
+            self._db.executescript(_SEARCH_SCHEMA)
+            with self._db:
+                if self._db.execute("PRAGMA user_version").fetchone()[0] < SEARCH_VERSION:
+                    # Index dari aturan stemming lama → isi ulang semuanya
+                    self._db.execute("DELETE FROM search")
+                    self._db.execute(f"PRAGMA user_version = {SEARCH_VERSION}")
+                self._backfill()
+            self.searchable = True
+        except sqlite3.OperationalError as e:
+            print(f"Store: pencarian tidak tersedia ({e})")
+            self.searchable = False
+
+    def _backfill(self):
+        # Artikel yang belum ter-index (mis. store dari versi sebelum ada pencarian)
+        self._db.execute(
+            "INSERT INTO search (rowid, title, body) "
+            "SELECT a.rowid, search_text(a.title), search_text(b.text) "
+            "FROM articles a LEFT JOIN bodies b ON b.link_key = a.link_key "
+            "WHERE a.rowid NOT IN (SELECT rowid FROM search)"
+        )
+
+    def upsert(self, articles, now=None):
+        """
+        Simpan hasil scrape. Artikel baru di-insert, yang isinya berubah
+        di-update, sisanya hanya last_seen yang diperbarui.
+        Mengembalikan (jumlah baru, jumlah berubah).
+        """
+        now = time.time() if now is None else now
+        incoming = {}
+        for art in articles:
+            incoming.setdefault(normalize_link(art["link"]), art)
+        if not incoming:
+            return 0, 0
+
+        with self._lock, self._db:
+            existing = {}
+            keys = list(incoming)
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows = self._db.execute(
+                    f"SELECT link_key, {', '.join(FIELDS)} FROM articles "
+                    f"WHERE link_key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for row in rows:
+                    existing[row["link_key"]] = tuple(row[f] for f in FIELDS)
+
+            new, changed, seen, retitled = [], [], [], []
+            title = FIELDS.index("title")
+            for key, art in incoming.items():
+                values = tuple(art.get(f, "") for f in FIELDS)
+                old = existing.get(key)
+                if old is None:
+                    new.append((key, *values, now, now))
+                elif old != values:
+                    changed.append((*values, now, key))
+                    if old[title] != values[title]:
+                        retitled.append((key,))
+                else:
+                    seen.append((now, key))
+
+            if new:
+                self._db.executemany(
+                    f"INSERT INTO articles (link_key, {', '.join(FIELDS)}, first_seen, last_seen) "
+                    f"VALUES (?, {', '.join('?' * len(FIELDS))}, ?, ?)",
+                    new,
+                )
+            if changed:
+                self._db.executemany(
+                    f"UPDATE articles SET {', '.join(f + ' = ?' for f in FIELDS)}, last_seen = ? "
+                    "WHERE link_key = ?",
+                    changed,
+                )
+            if seen:
+                self._db.executemany(
+                    "UPDATE articles SET last_seen = ? WHERE link_key = ?", seen
+                )
+            if self.searchable:
+                self._db.executemany(
+                    "INSERT INTO search (rowid, title, body) "
+                    "SELECT rowid, search_text(title), '' FROM articles WHERE link_key = ?",
+                    [(row[0],) for row in new],
+                )
+                self._db.executemany(
+                    "UPDATE search SET title = (SELECT search_text(title) FROM articles WHERE link_key = ?1) "
+                    "WHERE rowid = (SELECT rowid FROM articles WHERE link_key = ?1)",
+                    retitled,
+                )
+        return len(new), len(changed)
+
+    def recent(self, max_age, limit=500, now=None):
+        """Artikel yang terlihat dalam `max_age` detik terakhir, terbaru (first_seen) dulu."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join(FIELDS)}, first_seen, last_seen FROM articles "
+                "WHERE last_seen >= ? ORDER BY first_seen DESC, last_seen DESC LIMIT ?",
+                (now - max_age, limit),
+            ).fetchall()
+        return [Article(**row) for row in map(dict, rows)]
+
+    def last_update(self):
+        """last_seen terbaru (epoch), atau None kalau store kosong."""
+        with self._lock:
+            row = self._db.execute("SELECT MAX(last_seen) FROM articles").fetchone()
+        return row[0]
+
+    def prune(self, older_than=RETENTION, now=None):
+        now = time.time() if now is None else now
+        cutoff = (now - older_than,)
+        with self._lock, self._db:
+            if self.searchable:
+                self._db.execute(
+                    "DELETE FROM search WHERE rowid IN "
+                    "(SELECT rowid FROM articles WHERE last_seen < ?)", cutoff,
+                )
+            self._db.execute(
+                "DELETE FROM bodies WHERE link_key IN "
+                "(SELECT link_key FROM articles WHERE last_seen < ?)", cutoff,
+            )
+            cur = self._db.execute("DELETE FROM articles WHERE last_seen < ?", cutoff)
+        return cur.rowcount
+
+    # ─── Isi artikel & pencarian ───
+    def without_body(self, limit, retry_after, now=None):
+        """
+        Link artikel yang isinya belum diambil, terbaru dulu. Yang dulu
+        gagal (isi kosong) diikutkan lagi setelah `retry_after` detik.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT a.link FROM articles a LEFT JOIN bodies b ON b.link_key = a.link_key "
+                "WHERE b.link_key IS NULL OR (b.text = '' AND b.fetched_at < ?) "
+                "ORDER BY a.first_seen DESC LIMIT ?",
+                (now - retry_after, limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def set_body(self, link, text, now=None):
+        """Simpan isi artikel ("" = gagal diambil) dan index-kan ke pencarian."""
+        now = time.time() if now is None else now
+        key = normalize_link(link)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO bodies (link_key, text, fetched_at) VALUES (?, ?, ?)",
+                (key, text, now),
+            )
+            if self.searchable and text:
+                self._db.execute(
+                    "UPDATE search SET body = ? "
+                    "WHERE rowid = (SELECT rowid FROM articles WHERE link_key = ?)",
+                    (_search_text(text), key),
+                )
+
+    def search(self, query, limit=20, offset=0, category=None, source=None):
+        """
+        Artikel yang judul / isinya memuat semua kata di `query` (setelah
+        stemming), urut relevansi BM25 lalu terbaru. [] kalau query hanya
+        berisi stopword.
+        """
+        match = _match_query(query)
+        if match is None:
+            return []
+        where, params = ["search MATCH ?"], [match]
+        if category:
+            where.append("a.category = ?")
+            params.append(category)
+        if source:
+            where.append("a.source = ?")
+            params.append(source)
+        weights = ", ".join(map(str, SEARCH_WEIGHTS))
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {', '.join('a.' + f for f in FIELDS)}, a.first_seen, a.last_seen "
+                "FROM search JOIN articles a ON a.rowid = search.rowid "
+                f"WHERE {' AND '.join(where)} "
+                f"ORDER BY bm25(search, {weights}), a.first_seen DESC LIMIT ? OFFSET ?",
+                (*params, limit, offset),
+            ).fetchall()
+        return [Article(**row) for row in map(dict, rows)]
+
+
+def from_env():
+    return ArticleStore(os.environ.get("ARTICLE_DB", DEFAULT_PATH))
@@ -0,0 +1,159 @@
+# streamparse.py — Parse halaman listing secara streaming (lxml)
+#
+# Body dikirim per potongan ke parser berbasis event (lxml HTMLPullParser).
+# Card dikeluarkan begitu elemennya selesai (tag penutup terbaca), urut
+# sesuai posisi di dokumen, dan pembacaan berhenti setelah `limit` card —
+# sisa halaman tidak pernah di-download maupun di-parse.
+#
+# Selector yang didukung hanya compound selector sederhana (tanpa
+# combinator), dipisah koma:
+#     tag  .class  #id  [attr]  [attr=v]  [attr*=v]  [attr^=v]  [attr$=v]
+#     [attr~=v]  [attr|=v]
+# Selector lain → ValueError, pemanggil sebaiknya kembali ke BeautifulSoup.
+import re
+from collections import deque
+from functools import lru_cache
+
+
+_COMPOUND_RE = re.compile(
+    r"""
+    (?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)?
+    (?P<rest>(?:
+        \.[\w-]+
+      | \#[\w-]+
+      | \[\s*[\w:-]+\s*(?:[*^$~|]?=\s*(?:"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+    )*)
+    """,
+    re.X,
+)
+_PART_RE = re.compile(
+    r"""
+      \.(?P<cls>[\w-]+)
+    | \#(?P<id>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?:"(?P<v1>[^"]*)"|'(?P<v2>[^']*)'|(?P<v3>[^\]\s]+))\s*)?\]
+    """,
+    re.X,
+)
+
+_OPS = {
+    None: lambda got, want: True,
+    "=" : lambda got, want: got == want,
+    "*=": lambda got, want: bool(want) and want in got,
+    "^=": lambda got, want: bool(want) and got.startswith(want),
+    "$=": lambda got, want: bool(want) and got.endswith(want),
+    "~=": lambda got, want: want in got.split(),
+    "|=": lambda got, want: got == want or got.startswith(want + "-"),
+}
+
+
+def _compile_compound(text):
+    m = _COMPOUND_RE.fullmatch(text)
+    if not m or not text:
+        raise ValueError(f"selector tidak didukung untuk mode streaming: {text!r}")
+    tag = m.group("tag")
+    tag = None if tag in (None, "*") else tag.lower()
+    checks = []
+    for part in _PART_RE.finditer(m.group("rest")):
+        if part.group("cls"):
+            checks.append(("class", "~=", part.group("cls")))
+        elif part.group("id"):
+            checks.append(("id", "=", part.group("id")))
+        else:
+            value = part.group("v1")
+            if value is None:
+                value = part.group("v2") if part.group("v2") is not None else part.group("v3")
+            checks.append((part.group("attr").lower(), part.group("op"), value))
+    return tag, tuple(checks)
+
+
+@lru_cache(maxsize=None)
+def compile_selector(css: str):
+    """Compile daftar compound selector → tuple (tag, checks)."""
+    return tuple(_compile_compound(part.strip()) for part in css.split(","))
+
+
+def matches(el, compiled) -> bool:
+    tag = el.tag
+    if not isinstance(tag, str):  # komentar / processing instruction
+        return False
+    for want_tag, checks in compiled:
+        if want_tag and tag != want_tag:
+            continue
+        for attr, op, value in checks:
+            got = el.get(attr)
+            if got is None or not _OPS[op](got, value):
+                break
+        else:
+            return True
+    return False
+
+
+def select_one(css: str, el):
+    """Descendant pertama (urutan dokumen) yang cocok, seperti Tag.select_one."""
+    compiled = compile_selector(css)
+    for node in el.iterdescendants():
+        if matches(node, compiled):
+            return node
+    return None
+
+
+def select(css: str, root, limit=0):
+    compiled = compile_selector(css)
+    found = []
+    for node in root.iter():
+        if matches(node, compiled):
+            found.append(node)
+            if limit and len(found) >= limit:
+                break
+    return found
+
+
+def text(el) -> str:
+    return "".join(el.itertext())
+
+
+def iter_cards(chunks, card_css: str, limit: int, fallback_css=None, encoding=None):
+    """
+    Feed potongan body ke parser dan yield elemen card yang sudah lengkap,
+    dalam urutan dokumen, maksimal `limit` buah. Begitu `limit` tercapai
+    generator berhenti dan sisa `chunks` tidak dibaca lagi.
+
+    Card yang bersarang di dalam card lain baru dikeluarkan setelah card
+    luarnya selesai, supaya urutannya sama dengan soup.select(). Kalau
+    sampai akhir dokumen tidak ada satu pun card, `fallback_css` dicari
+    di seluruh dokumen.
+    """
+    from lxml import etree   # di sini, bukan di atas: import modul ini tetap murah
+
+    compiled = compile_selector(card_css)
+    parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+    pending = deque()   # card yang sudah dibuka, urut dokumen
+    waiting = set()     # card yang sama, untuk cek cepat saat tag ditutup
+    closed = set()
+    emitted = 0
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, el in parser.read_events():
+            if event == "start":
+                if matches(el, compiled):
+                    pending.append(el)
+                    waiting.add(el)
+                continue
+            if el not in waiting:
+                continue
+            closed.add(el)
+            while pending and pending[0] in closed:
+                card = pending.popleft()
+                waiting.discard(card)
+                closed.discard(card)
+                yield card
+                emitted += 1
+                if emitted >= limit:
+                    return
+    root = parser.close()
+    # Dokumen habis: sisa card ditutup otomatis oleh parser
+    while pending and emitted < limit:
+        yield pending.popleft()
+        emitted += 1
+    if emitted == 0 and fallback_css and root is not None:
+        yield from select(fallback_css, root, limit)
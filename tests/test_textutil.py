@@ -0,0 +1,57 @@
+# tests/test_textutil.py — Tabel stemming: kata → kandidat yang wajib ada
+#
+# Jalankan: python -m pytest -q tests
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from textutil import stem, stems  # noqa: E402
+
+# (kata, kata dasar yang harus ada di stems(kata))
+STEMS = [
+    # awalan & peluluhan
+    ("pemberitaan", "berita"),
+    ("memperbaiki", "baik"),
+    ("diperbaiki", "baik"),
+    ("keberhasilan", "hasil"),
+    ("kebakaran", "bakar"),
+    ("pemerintahan", "perintah"),
+    ("pertandingan", "tanding"),
+    ("menggunakan", "guna"),
+    ("tersangka", "sangka"),
+    ("melakukan", "laku"),
+    ("menyapu", "sapu"),
+    # akar berakhiran k + -an (bukan -kan)
+    ("penembakan", "tembak"),
+    ("kenaikan", "naik"),
+    ("perbaikan", "baik"),
+    ("pelantikan", "lantik"),
+    # "awalan" yang ternyata bagian kata dasar
+    ("menang", "menang"),
+    ("kemenangan", "menang"),
+]
+
+# Kata yang tidak boleh berubah
+UNCHANGED = ["berita", "perang", "kepala", "menteri", "polisi", "jalan", "bulan", "kerja", "2024"]
+
+
+@pytest.mark.parametrize("word,root", STEMS)
+def test_stems_contains_root(word, root):
+    assert root in stems(word)
+
+
+@pytest.mark.parametrize("word", UNCHANGED)
+def test_unchanged(word):
+    assert stem(word) == word
+
+
+@pytest.mark.parametrize("a,b", [
+    ("penembakan", "ditembak"),
+    ("kemenangan", "menang"),
+    ("perbaikan", "memperbaiki"),
+])
+def test_forms_share_a_stem(a, b):
+    assert set(stems(a)) & set(stems(b))
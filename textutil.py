@@ -0,0 +1,115 @@
+# textutil.py — Tokenisasi teks berita (Bahasa Indonesia) yang dipakai bersama
+import re
+from functools import lru_cache
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Kata fungsi yang tidak membedakan satu berita dengan berita lain
+STOPWORDS = frozenset("""
+    yang di ke dari dan atau ini itu untuk dengan pada dalam akan juga
+    karena oleh sebagai soal jadi ada tak tidak bisa usai saat hingga
+    sudah telah masih para kata ia dia mereka kami kita agar bagi
+    tentang setelah sebelum antara lebih serta namun tapi bahwa jika
+    begini begitu apa siapa kenapa mengapa bagaimana simak berikut
+    the a an of in on to for and or is are with at by from
+""".split())
+
+
+def tokenize(text: str) -> list:
+    """Huruf kecil, pecah per kata, buang stopword & token 1 huruf."""
+    return [
+        tok for tok in _WORD_RE.findall(text.lower())
+        if len(tok) > 1 and tok not in STOPWORDS
+    ]
+
+
+# ─── Stemming (untuk index pencarian) ───
+# Versi ringkas aturan Nazief–Adriani tanpa kamus kata dasar: partikel &
+# -nya, lalu akhiran turunan, lalu awalan (dengan peluluhan me-/pe-).
+# Tanpa kamus, pemotongan bisa ambigu:
+#   - "-kan" atau "-an" setelah akar berakhiran k: penembakan → temba-kan
+#     atau tembak-an; kenaikan → kenai / naik
+#   - "awalan" yang ternyata bagian kata dasar: menang → me-tang atau menang
+# Karena itu stems() mengembalikan SEMUA kandidat; index menyimpan semuanya
+# dan query cocok kalau salah satu kandidatnya ada (lihat store.search).
+# Sisa kata minimal MIN_STEM huruf supaya kata pendek ("berat", "jalan",
+# "kerja") tidak rusak.
+MIN_STEM = 4
+
+# -lah, -ku, -mu tidak dibuang: terlalu banyak kata dasar yang berakhiran
+# sama (masalah, sekolah, temu, ilmu), sedangkan di judul berita jarang dipakai
+_INFLECTIONAL = ("kah", "pun", "nya")
+_DERIVATIONAL = ("kan", "an", "i")
+
+# (pola, pengganti) — aturan pertama yang cocok menentukan
+_PREFIXES = tuple((re.compile(p), r) for p, r in (
+    (r"^(?:me|pe)ng(?=[aiueoghkq])", ""),   # mengambil, menggali, pengadilan
+    (r"^(?:me|pe)ny(?=[aiueo])",     "s"),  # menyapu → sapu
+    (r"^(?:me|pe)m(?=[bfpv])",       ""),   # membaca, memperbaiki
+    (r"^(?:me|pe)m(?=[aiueo])",      "p"),  # memukul → pukul, pemerintah → perintah
+    (r"^(?:me|pe)n(?=[cdjz])",       ""),   # mencari, pendapat
+    (r"^(?:me|pe)n(?=[aiueo])",      "t"),  # menulis → tulis, menembak → tembak
+    (r"^per(?=[^aiueo])",            ""),   # pertanian (bukan "perang")
+    (r"^(?:ber|ter)",                ""),   # bermain, terakhir
+    (r"^me(?=[lrwy])",               ""),   # melihat, merusak
+    (r"^pe(?=[lwy])",                ""),   # pelaku ("pe-r" tidak: perang, peran)
+    (r"^di",                         ""),   # dibuat
+))
+# Awalan kedua yang sah setelah awalan pertama (diper-, keber-, memper-, ...)
+_INNER_PREFIXES = _PREFIXES[6:8]
+
+
+def _strip_suffix(word: str, suffixes) -> str:
+    for suffix in suffixes:
+        if word.endswith(suffix):
+            rest = word[:-len(suffix)]
+            return rest if len(rest) >= MIN_STEM else word
+    return word
+
+
+def _strip_prefix(word: str, rules):
+    """Kata tanpa awalan, atau None kalau tidak ada awalan yang bisa dibuang."""
+    for pattern, repl in rules:
+        m = pattern.match(word)
+        if m:
+            rest = repl + word[m.end():]
+            return rest if len(rest) >= MIN_STEM else None
+    return None
+
+
+def _unprefix(word: str, base: str):
+    """Kata dasar dari `base` (= `word` tanpa akhiran turunan), atau None kalau tanpa awalan."""
+    core = _strip_prefix(base, _PREFIXES)
+    if core is None and word.endswith("an") and base.startswith("ke") and len(base) - 2 >= MIN_STEM:
+        core = base[2:]   # ke-...-an: kebakaran → bakar (tanpa -an, "ke" dibiarkan: kepala)
+    if core is None:
+        return None
+    return _strip_prefix(core, _INNER_PREFIXES) or core
+
+
+@lru_cache(maxsize=50_000)
+def stems(word: str) -> tuple:
+    """
+    Kandidat kata dasar satu token huruf kecil, yang paling mungkin dulu;
+    angka dll. apa adanya.
+    """
+    if len(word) <= MIN_STEM or not word.isalpha():
+        return (word,)
+    word = _strip_suffix(_strip_suffix(word, _INFLECTIONAL[:2]), _INFLECTIONAL[2:])
+    bases = [_strip_suffix(word, _DERIVATIONAL)]
+    if word.endswith("kan") and len(word) - 2 >= MIN_STEM:
+        bases.append(word[:-2])   # akar berakhiran k + -an: kenaikan → naik
+    found = [core for core in (_unprefix(word, base) for base in bases) if core]
+    # Tanpa awalan (menang, menteri); -i tidak dibuang di sini (polisi)
+    found.append(_strip_suffix(word, _DERIVATIONAL[:2]))
+    return tuple(dict.fromkeys(found))
+
+
+def stem(word: str) -> str:
+    """Kandidat kata dasar yang paling mungkin (lihat stems)."""
+    return stems(word)[0]
+
+
+def terms(text: str) -> list:
+    """Semua kandidat kata dasar setiap token — bentuk yang disimpan di index pencarian."""
+    return [s for tok in tokenize(text) for s in stems(tok)]